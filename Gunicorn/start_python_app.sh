@@ -1,3 +1,7 @@
 #!/bin/bash
 echo "Starting Gunicorn server..."
-gunicorn --bind 0.0.0.0:8080 wsgi:app
\ No newline at end of file
+export VECTOR_INDEX_PATH="${VECTOR_INDEX_PATH:-.cache/vector-index}"
+export PRELOAD_SERVICES="${PRELOAD_SERVICES:-1}"
+export METRICS_DIR="${METRICS_DIR:-.cache/metrics}"
+rm -f "$METRICS_DIR"/metrics-*.json
+gunicorn --preload --bind 0.0.0.0:8080 wsgi:app
\ No newline at end of file
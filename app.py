@@ -1,76 +1,167 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
 from dotenv import load_dotenv
+import hmac
+import json
 import os
-from models.rag_service import RAGService
-from models.vector_db import setup_vector_db
-from models.product_catalog import load_product_catalog
+from models.catalog_updates import apply_catalog_delta, parse_catalog_delta
+from models.metrics import metrics
+from models.product_filter import ProductFilter
+from models.rag_service import RETRIEVAL_MODES, model_info, technical_info
+from models.session_store import SessionNotFoundError
+from services import get_catalog, get_rag_service
 
 load_dotenv()
 
-app = Flask(__name__)
-
-products = load_product_catalog()
-vector_db = setup_vector_db()
-rag_service = RAGService(vector_db, products)
-
-@app.route('/')
-def index():
-    return render_template('index.html')
-
-@app.route('/api/products')
-def get_products():
-    return jsonify(products)
-
-@app.route('/api/products/<int:product_id>')
-def get_product(product_id):
-    product = next((p for p in products if p['id'] == product_id), None)
-    if product:
-        return jsonify(product)
-    return jsonify({"error": "Product not found"}), 404
-
-@app.route('/api/query', methods=['POST'])
-def process_query():
-    data = request.json
-    query = data.get('query', '')
-    if not query:
-        return jsonify({"error": "Missing query parameter"}), 400
-    
-    result = rag_service.process_query(query)
-    return jsonify(result)
-
-@app.route('/api/query/followup', methods=['POST'])
-def process_followup_query():
-    data = request.json
-    original_query = data.get('originalQuery', '')
-    followup_query = data.get('followupQuery', '')
-    
-    if not original_query or not followup_query:
-        return jsonify({"error": "Missing query parameters"}), 400
-    
-    result = rag_service.process_followup_query(original_query, followup_query)
-    return jsonify(result)
-
-@app.route('/api/model-info')
-def get_model_info():
-    info = rag_service.get_model_info()
-    return jsonify(info)
-
-@app.route('/api/technical-info')
-def get_technical_info():
-    info = rag_service.get_technical_info()
-    return jsonify(info)
-
-@app.route('/api/search')
-def search():
-    query = request.args.get('q', '')
-    if not query:
-        return jsonify({
-            "error": "Missing query parameter",
-            "usage": "Use ?q=your search query"
-        }), 400
-    
-    result = rag_service.process_query(query, max_results=10, threshold=0.3)
-    return jsonify(result)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def create_app() -> Flask:
+    app = Flask(
+        __name__,
+        static_folder=os.path.join(BASE_DIR, 'static'),
+        template_folder=os.path.join(BASE_DIR, 'templates')
+    )
+
+    @app.route('/')
+    def index():
+        return render_template('index.html')
+
+    @app.route('/api/products')
+    def get_products_route():
+        category = request.args.get('category')
+        products = get_catalog().by_category(category) if category else get_catalog()
+        return jsonify([product.to_dict() for product in products])
+
+    @app.route('/api/products/<int:product_id>')
+    def get_product(product_id):
+        product = get_catalog().get(product_id)
+        if product:
+            return jsonify(product.to_dict())
+        return jsonify({"error": "Product not found"}), 404
+
+    @app.route('/api/query', methods=['POST'])
+    def process_query():
+        data = request.json
+        query = data.get('query', '')
+        if not query:
+            return jsonify({"error": "Missing query parameter"}), 400
+        
+        mode = data.get('mode')
+        if mode is not None and mode not in RETRIEVAL_MODES:
+            return jsonify({"error": f"Invalid mode, expected one of: {', '.join(RETRIEVAL_MODES)}"}), 400
+
+        try:
+            product_filter = ProductFilter.from_args(data.get('filters') or {})
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        result = get_rag_service().process_query(query, mode=mode, product_filter=product_filter)
+        return jsonify(result)
+
+    @app.route('/api/query/stream', methods=['POST'])
+    def process_query_stream():
+        data = request.json
+        query = data.get('query', '')
+        if not query:
+            return jsonify({"error": "Missing query parameter"}), 400
+
+        events = get_rag_service().stream_query(query)
+        body = (f"event: {event}\ndata: {json.dumps(payload)}\n\n" for event, payload in events)
+        return Response(stream_with_context(body), mimetype='text/event-stream', headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        })
+
+    @app.route('/api/query/batch', methods=['POST'])
+    def process_query_batch():
+        data = request.json
+        queries = data.get('queries', [])
+        if not isinstance(queries, list) or not queries or not all(isinstance(q, str) and q for q in queries):
+            return jsonify({"error": "Missing or invalid queries parameter"}), 400
+
+        rag_service = get_rag_service()
+        if len(queries) > rag_service.max_batch_queries:
+            return jsonify({"error": f"Too many queries, the maximum batch size is {rag_service.max_batch_queries}"}), 400
+
+        results = rag_service.process_queries(queries)
+        return jsonify({"results": results})
+
+    @app.route('/api/query/followup', methods=['POST'])
+    def process_followup_query():
+        data = request.json
+        original_query = data.get('originalQuery', '')
+        followup_query = data.get('followupQuery', '')
+        session_id = data.get('sessionId')
+        
+        if not (original_query or session_id) or not followup_query:
+            return jsonify({"error": "Missing query parameters"}), 400
+        
+        try:
+            result = get_rag_service().process_followup_query(original_query, followup_query, session_id)
+        except SessionNotFoundError:
+            return jsonify({"error": "Session not found or expired"}), 404
+        return jsonify(result)
+
+    @app.route('/api/admin/catalog', methods=['POST'])
+    def update_catalog():
+        admin_token = os.getenv('ADMIN_TOKEN')
+        if not admin_token:
+            return jsonify({"error": "Admin API is disabled"}), 403
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token):
+            return jsonify({"error": "Invalid admin token"}), 401
+
+        try:
+            operations = parse_catalog_delta(request.get_data(as_text=True).splitlines())
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        summary = apply_catalog_delta(get_rag_service(), operations)
+        return jsonify({**summary, "catalogSize": len(get_catalog())})
+
+    @app.route('/api/model-info')
+    def get_model_info():
+        return jsonify(model_info())
+
+    @app.route('/api/technical-info')
+    def get_technical_info():
+        return jsonify(technical_info(len(get_catalog())))
+
+    @app.route('/api/cache-stats')
+    def get_cache_stats():
+        return jsonify(get_rag_service().get_cache_stats())
+
+    @app.route('/api/metrics')
+    def get_metrics():
+        return jsonify(metrics.summary())
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    @app.route('/api/search')
+    def search():
+        query = request.args.get('q', '')
+        if not query:
+            return jsonify({
+                "error": "Missing query parameter",
+                "usage": "Use ?q=your search query"
+            }), 400
+        
+        mode = request.args.get('mode')
+        if mode is not None and mode not in RETRIEVAL_MODES:
+            return jsonify({"error": f"Invalid mode, expected one of: {', '.join(RETRIEVAL_MODES)}"}), 400
+
+        try:
+            product_filter = ProductFilter.from_args({**request.args, "spec": request.args.getlist('spec')})
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        result = get_rag_service().process_query(query, max_results=10, threshold=0.3, mode=mode,
+                                                 product_filter=product_filter)
+        return jsonify(result)
+
+    return app
+
+app = create_app()
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
@@ -0,0 +1,96 @@
+from starlette.applications import Starlette
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from app import app as flask_app
+from models.product_filter import ProductFilter
+from models.rag_service import RETRIEVAL_MODES, RAGService
+from models.session_store import SessionNotFoundError
+import asyncio
+import contextlib
+import services
+
+services.preload_if_configured()
+
+async def _rag_service() -> RAGService:
+    if services.is_initialized():
+        return services.get_rag_service()
+    return await asyncio.to_thread(services.get_rag_service)
+
+async def _json_body(request: Request) -> dict:
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+async def process_query(request: Request) -> JSONResponse:
+    data = await _json_body(request)
+    query = data.get('query', '')
+    if not query:
+        return JSONResponse({"error": "Missing query parameter"}, status_code=400)
+
+    mode = data.get('mode')
+    if mode is not None and mode not in RETRIEVAL_MODES:
+        return JSONResponse({"error": f"Invalid mode, expected one of: {', '.join(RETRIEVAL_MODES)}"}, status_code=400)
+
+    try:
+        product_filter = ProductFilter.from_args(data.get('filters') or {})
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    rag_service = await _rag_service()
+    result = await rag_service.aprocess_query(query, mode=mode, product_filter=product_filter)
+    return JSONResponse(result)
+
+async def process_followup_query(request: Request) -> JSONResponse:
+    data = await _json_body(request)
+    original_query = data.get('originalQuery', '')
+    followup_query = data.get('followupQuery', '')
+    session_id = data.get('sessionId')
+
+    if not (original_query or session_id) or not followup_query:
+        return JSONResponse({"error": "Missing query parameters"}, status_code=400)
+
+    rag_service = await _rag_service()
+    try:
+        result = await rag_service.aprocess_followup_query(original_query, followup_query, session_id)
+    except SessionNotFoundError:
+        return JSONResponse({"error": "Session not found or expired"}, status_code=404)
+    return JSONResponse(result)
+
+async def search(request: Request) -> JSONResponse:
+    query = request.query_params.get('q', '')
+    if not query:
+        return JSONResponse({
+            "error": "Missing query parameter",
+            "usage": "Use ?q=your search query"
+        }, status_code=400)
+
+    mode = request.query_params.get('mode')
+    if mode is not None and mode not in RETRIEVAL_MODES:
+        return JSONResponse({"error": f"Invalid mode, expected one of: {', '.join(RETRIEVAL_MODES)}"}, status_code=400)
+
+    try:
+        product_filter = ProductFilter.from_args({**request.query_params, "spec": request.query_params.getlist('spec')})
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    rag_service = await _rag_service()
+    result = await rag_service.aprocess_query(query, max_results=10, threshold=0.3, mode=mode,
+                                              product_filter=product_filter)
+    return JSONResponse(result)
+
+@contextlib.asynccontextmanager
+async def lifespan(app: Starlette):
+    yield
+    if services.is_initialized():
+        await services.get_rag_service().openai_service.aclose()
+
+app = Starlette(lifespan=lifespan, routes=[
+    Route('/api/query', process_query, methods=['POST']),
+    Route('/api/query/followup', process_followup_query, methods=['POST']),
+    Route('/api/search', search),
+    Mount('/', WSGIMiddleware(flask_app))
+])
\ No newline at end of file
@@ -0,0 +1,83 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.vector_db import setup_vector_db
+
+def make_vectors(rng: np.random.Generator, count: int, dimensions: int, clusters: int) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dimensions)).astype(np.float32)
+    labels = rng.integers(0, clusters, count)
+    return centers[labels] + 0.5 * rng.standard_normal((count, dimensions)).astype(np.float32)
+
+def timed_search(db, queries: np.ndarray, limit: int):
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        results.append([match.id for match in db.similarity_search(query, limit=limit, score_threshold=-1.0)])
+    elapsed = time.perf_counter() - start
+    return results, elapsed * 1000 / len(queries)
+
+def recall(truth, found) -> float:
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+    return hits / max(1, sum(len(t) for t in truth))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recall vs latency of the IVF engine against exact search")
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--dimensions', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--nlist', type=int, default=None)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    clusters = max(1, args.size // 100)
+    vectors = make_vectors(rng, args.size, args.dimensions, clusters)
+    queries = make_vectors(rng, args.queries, args.dimensions, clusters)
+
+    exact = setup_vector_db('exact', dimensions=args.dimensions)
+    exact.add_vectors(np.arange(args.size), vectors)
+    truth, exact_ms = timed_search(exact, queries, args.limit)
+
+    ivf = setup_vector_db('ivf', dimensions=args.dimensions, nlist=args.nlist, seed=args.seed)
+    ivf.add_vectors(np.arange(args.size), vectors)
+    start = time.perf_counter()
+    ivf.build_index()
+    build_s = time.perf_counter() - start
+
+    rows = [{"engine": "exact", "nprobe": None, "recall": 1.0, "latency_ms": exact_ms}]
+    for nprobe in args.nprobe:
+        ivf.nprobe = nprobe
+        found, ivf_ms = timed_search(ivf, queries, args.limit)
+        rows.append({"engine": "ivf", "nprobe": nprobe, "recall": recall(truth, found), "latency_ms": ivf_ms})
+
+    report = {
+        "size": args.size,
+        "dimensions": args.dimensions,
+        "limit": args.limit,
+        "nlist": int(ivf._centroids.shape[0]),
+        "build_seconds": build_s,
+        "results": rows,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"size={args.size} dims={args.dimensions} k={args.limit} nlist={report['nlist']} build={build_s:.2f}s")
+    print(f"{'engine':<8}{'nprobe':>8}{'recall@k':>12}{'ms/query':>12}")
+    for row in rows:
+        nprobe = '-' if row['nprobe'] is None else row['nprobe']
+        print(f"{row['engine']:<8}{nprobe:>8}{row['recall']:>12.3f}{row['latency_ms']:>12.3f}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
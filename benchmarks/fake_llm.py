@@ -0,0 +1,105 @@
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+
+    delay_seconds = 0.5
+    token_interval = 0.05
+    error_rate = 0.0
+    error_status = 503
+    content = "- Fast local stub response"
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+
+        time.sleep(self.delay_seconds)
+
+        if random.random() < self.error_rate:
+            payload = json.dumps({"error": {"message": "Injected failure", "type": "server_error"}}).encode('utf-8')
+            self.send_response(self.error_status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        if body.get('stream'):
+            self._stream(body)
+            return
+
+        content = self.content
+        if (body.get('response_format') or {}).get('type') == 'json_object':
+            content = json.dumps({"response": self.content, "rationale": [self.content]})
+
+        payload = json.dumps({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get('model', 'fake'),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, body):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+
+        for i, token in enumerate(self.content.split(' ')):
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get('model', 'fake'),
+                "choices": [{"index": 0, "delta": {"content": token if i == 0 else f" {token}"}, "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(self.token_interval)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(host: str = '127.0.0.1', port: int = 0, delay_seconds: float = 0.5, token_interval: float = 0.05,
+                error_rate: float = 0.0, error_status: int = 503) -> ThreadingHTTPServer:
+    handler = type('ConfiguredFakeLLMHandler', (FakeLLMHandler,), {
+        "delay_seconds": delay_seconds,
+        "token_interval": token_interval,
+        "error_rate": error_rate,
+        "error_status": error_status
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible chat completion stub with injected latency")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--delay', type=float, default=0.5, help="Seconds to wait before answering each request")
+    parser.add_argument('--token-interval', type=float, default=0.05, help="Seconds between streamed tokens")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument('--error-status', type=int, default=503, help="HTTP status used for injected failures (e.g. 429, 500)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.delay, args.token_interval, args.error_rate, args.error_status)
+    print(f"Fake LLM listening on http://{args.host}:{server.server_address[1]}/v1 (delay {args.delay}s)")
+    server.serve_forever()
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
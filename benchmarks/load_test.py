@@ -0,0 +1,116 @@
+import argparse
+import json
+import threading
+import time
+from http.client import HTTPConnection
+from urllib.parse import quote, urlsplit
+
+ENDPOINTS = {
+    "query": ("POST", "/api/query", lambda q: {"query": q}),
+    "followup": ("POST", "/api/query/followup", lambda q: {"originalQuery": q, "followupQuery": "Which one has the best battery?"}),
+    "search": ("GET", "/api/search?q={query}", None),
+}
+
+DEFAULT_QUERIES = [
+    "gaming laptop under 1000",
+    "laptop for video editing",
+    "cheap laptop with good battery",
+    "best graphics card laptop",
+    "lightweight laptop for students",
+]
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run_worker(host: str, port: int, endpoint: str, queries, deadline: float, latencies, errors, lock) -> None:
+    method, path, body_fn = ENDPOINTS[endpoint]
+    conn = HTTPConnection(host, port, timeout=60)
+    i = 0
+
+    while time.monotonic() < deadline:
+        query = queries[i % len(queries)]
+        i += 1
+
+        target = path.format(query=quote(query))
+        body = json.dumps(body_fn(query)) if body_fn else None
+        headers = {"Content-Type": "application/json"} if body else {}
+
+        start = time.perf_counter()
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status < 400
+        except Exception:
+            ok = False
+            conn.close()
+            conn = HTTPConnection(host, port, timeout=60)
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append(elapsed)
+
+    conn.close()
+
+def run_load_test(url: str, endpoint: str = 'query', concurrency: int = 32, duration: float = 20.0, queries=None):
+    parts = urlsplit(url)
+    queries = queries or DEFAULT_QUERIES
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=run_worker, args=(parts.hostname, parts.port or 80, endpoint, queries, deadline, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "url": url,
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "durationSeconds": elapsed,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughputRps": len(latencies) / elapsed if elapsed else 0.0,
+        "latencyMs": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+        },
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Closed-loop HTTP load test for the query endpoints")
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='query')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    result = run_load_test(args.url, args.endpoint, args.concurrency, args.duration)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    latency = result['latencyMs']
+    print(f"{result['endpoint']} @ {result['url']} concurrency={result['concurrency']}")
+    print(f"requests={result['requests']} errors={result['errors']} throughput={result['throughputRps']:.1f} req/s")
+    print(f"latency p50={latency['p50']:.1f}ms p95={latency['p95']:.1f}ms p99={latency['p99']:.1f}ms")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
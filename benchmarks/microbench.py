@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_catalog import iter_product_chunks
+from models.keyword_index import KeywordIndex
+from models.parallel_build import build_vectors_parallel
+from models.product_catalog import ProductCatalog
+from models.product_filter import FilterIndex, ProductFilter
+from models.vector_db import create_product_text, embed_batch, setup_vector_db
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+QUERIES = [
+    "gaming laptop with RTX 3060",
+    "lightweight laptop for students",
+    "phone with long battery life",
+    "tablet for drawing",
+    "144Hz monitor for gaming",
+    "laptop for video editing under 1000",
+    "cheap laptop with 16GB RAM",
+    "2TB SSD workstation",
+]
+
+def result(name: str, size: int, value: float, unit: str, better: str) -> Dict[str, Any]:
+    return {"name": name, "size": size, "value": value, "unit": unit, "better": better}
+
+def median_seconds(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def per_query_ms(fn: Callable[[str], Any], queries: List[str], repeat: int) -> float:
+    return median_seconds(lambda: [fn(query) for query in queries], repeat) * 1000 / len(queries)
+
+def bench_size(size: int, dimensions: int, repeat: int, seed: int, limit: int) -> List[Dict[str, Any]]:
+    rows = []
+
+    catalog = ProductCatalog()
+    texts = []
+    load_seconds = 0.0
+    for chunk in iter_product_chunks(size, seed=seed):
+        start = time.perf_counter()
+        catalog.extend(chunk)
+        load_seconds += time.perf_counter() - start
+        texts.extend(create_product_text(product) for product in chunk)
+    rows.append(result("catalog_load", size, size / load_seconds, "rows/s", "higher"))
+
+    vectors = np.zeros((size, dimensions), dtype=np.float32)
+    start = time.perf_counter()
+    for offset in range(0, size, 10000):
+        vectors[offset:offset + 10000] = embed_batch(texts[offset:offset + 10000], dimensions)
+    rows.append(result("embedding", size, size / (time.perf_counter() - start), "rows/s", "higher"))
+    ids = np.arange(1, size + 1)
+    del texts
+
+    exact = setup_vector_db('exact', dimensions=dimensions)
+    start = time.perf_counter()
+    exact.add_vectors(ids, vectors)
+    rows.append(result("index_build/exact", size, time.perf_counter() - start, "s", "lower"))
+
+    parallel = setup_vector_db('exact', dimensions=dimensions)
+    build = build_vectors_parallel(parallel, catalog, os.cpu_count())
+    rows.append(result("index_build/parallel", size, build['rowsPerSecond'], "rows/s", "higher"))
+    del parallel
+
+    ivf = setup_vector_db('ivf', dimensions=dimensions, seed=seed)
+    ivf.add_vectors(ids, vectors)
+    start = time.perf_counter()
+    ivf.build_index()
+    rows.append(result("index_build/ivf", size, time.perf_counter() - start, "s", "lower"))
+    del vectors
+
+    rows.append(result("query_embedding", size, per_query_ms(exact.get_embedding, QUERIES, repeat), "ms", "lower"))
+
+    query_vectors = exact.get_embeddings(QUERIES)
+    vector_queries = list(query_vectors)
+    for name, db in (("exact", exact), ("ivf", ivf)):
+        search = lambda vector: db.similarity_search(vector, limit=limit, score_threshold=-1.0)
+        rows.append(result(f"search/{name}", size, per_query_ms(search, vector_queries, repeat), "ms", "lower"))
+
+    batch_seconds = median_seconds(lambda: exact.similarity_search_batch(query_vectors, limit=limit, score_threshold=-1.0), repeat)
+    rows.append(result("search_batch/exact", size, batch_seconds * 1000 / len(QUERIES), "ms", "lower"))
+
+    scores = np.random.default_rng(seed).standard_normal(size).astype(np.float32)
+    rows.append(result("top_k", size, median_seconds(lambda: exact._top_k(scores, limit, -1.0), repeat) * 1000, "ms", "lower"))
+
+    filter_index = FilterIndex(exact.get_ids(), catalog.store)
+    product_filter = ProductFilter(category="Laptops", max_price=1500.0, min_rating=4.0)
+    filtered = lambda vector: exact.similarity_search(vector, limit=limit, score_threshold=-1.0,
+                                                      rows=filter_index.rows(product_filter))
+    rows.append(result("search/filtered", size, per_query_ms(filtered, vector_queries, repeat), "ms", "lower"))
+
+    keyword_index = KeywordIndex()
+    start = time.perf_counter()
+    for batch in catalog.iter_batches(10000):
+        keyword_index.add_documents([product['id'] for product in batch], [create_product_text(product) for product in batch])
+    keyword_index.search(QUERIES[0], limit)
+    rows.append(result("index_build/keyword", size, time.perf_counter() - start, "s", "lower"))
+    rows.append(result("search/keyword", size, per_query_ms(lambda query: keyword_index.search(query, limit), QUERIES, repeat),
+                       "ms", "lower"))
+
+    return rows
+
+def run_microbenchmarks(sizes: List[int], dimensions: int = 384, repeat: int = 5, seed: int = 0,
+                        limit: int = 10) -> List[Dict[str, Any]]:
+    rows = []
+    for size in sizes:
+        print(f"Benchmarking {size} products...", file=sys.stderr)
+        rows.extend(bench_size(size, dimensions, repeat, seed, limit))
+    return rows
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for embedding, index build, search and top-k")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--dimensions', type=int, default=384)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    rows = run_microbenchmarks(args.sizes, args.dimensions, args.repeat, args.seed, args.limit)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'benchmark':<22}{'size':>10}{'value':>14}  unit")
+    for row in rows:
+        print(f"{row['name']:<22}{row['size']:>10}{row['value']:>14.3f}  {row['unit']}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.client import HTTPConnection
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_llm import make_server
+from benchmarks.load_test import run_load_test
+from benchmarks.microbench import DEFAULT_SIZES, result, run_microbenchmarks
+from benchmarks.synthetic_catalog import write_jsonl
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def http_get_json(port: int, path: str, timeout: float = 10.0) -> Optional[Dict[str, Any]]:
+    conn = HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        body = response.read()
+        return json.loads(body) if response.status == 200 else None
+    except (OSError, ValueError):
+        return None
+    finally:
+        conn.close()
+
+def start_app_server(port: int, llm_port: int, catalog_path: str, metrics_dir: str, workers: int,
+                     asgi: bool) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "fake-key",
+        "OPENAI_API_BASE": f"http://127.0.0.1:{llm_port}/v1",
+        "OPENAI_REQUESTS_PER_MINUTE": "1000000",
+        "OPENAI_TOKENS_PER_MINUTE": "1000000000",
+        "PRODUCT_CATALOG_PATH": catalog_path,
+        "PRELOAD_SERVICES": "1",
+        "RESPONSE_CACHE_SIZE": "0",
+        "SEMANTIC_CACHE_SIZE": "0",
+        "METRICS_DIR": metrics_dir,
+        "METRICS_FLUSH_SECONDS": "1",
+    }
+    env.pop('VECTOR_INDEX_PATH', None)
+
+    command = [sys.executable, '-m', 'gunicorn', '--preload', '--bind', f"127.0.0.1:{port}", '--workers', str(workers)]
+    if asgi:
+        command += ['--worker-class', 'uvicorn.workers.UvicornWorker', 'asgi:app']
+    else:
+        command += ['--threads', '8', 'wsgi:app']
+    return subprocess.Popen(command, cwd=str(ROOT), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def wait_until_ready(port: int, server: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"App server exited with status {server.returncode}")
+        if http_get_json(port, '/api/cache-stats', timeout=2.0) is not None:
+            return
+        time.sleep(0.5)
+    raise RuntimeError(f"App server was not ready after {timeout}s")
+
+def run_http_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    rows = []
+    llm = make_server(delay_seconds=args.llm_delay, token_interval=0.0)
+    threading.Thread(target=llm.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory(prefix='rag-bench-') as workdir:
+        catalog_path = os.path.join(workdir, 'catalog.jsonl')
+        write_jsonl(catalog_path, args.http_catalog_size, args.seed)
+
+        port = free_port()
+        server = start_app_server(port, llm.server_address[1], catalog_path, os.path.join(workdir, 'metrics'),
+                                  args.workers, args.asgi)
+        try:
+            wait_until_ready(port, server, args.startup_timeout)
+            for endpoint in args.endpoints:
+                print(f"Load testing {endpoint}...", file=sys.stderr)
+                load = run_load_test(f"http://127.0.0.1:{port}", endpoint, args.concurrency, args.duration)
+                name = f"http/{endpoint}"
+                rows.append(result(f"{name}/throughput", args.http_catalog_size, load['throughputRps'], "req/s", "higher"))
+                for percentile, value in load['latencyMs'].items():
+                    rows.append(result(f"{name}/{percentile}", args.http_catalog_size, value, "ms", "lower"))
+                rows.append(result(f"{name}/errors", args.http_catalog_size, load['errors'], "requests", "lower"))
+
+            time.sleep(1.5)
+            server_metrics = http_get_json(port, '/api/metrics')
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            llm.shutdown()
+
+    return {"results": rows, "serverMetrics": server_metrics}
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[Dict[str, Any]]:
+    previous = {(row['name'], row['size']): row['value'] for row in baseline}
+    regressions = []
+    for row in results:
+        base = previous.get((row['name'], row['size']))
+        if base is None:
+            continue
+        if row['better'] == 'lower':
+            regressed = row['value'] > base * (1 + tolerance)
+        else:
+            regressed = row['value'] < base * (1 - tolerance)
+        if regressed:
+            regressions.append({**row, "baseline": base})
+    return regressions
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the retrieval microbenchmarks and the HTTP load test")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Synthetic catalog sizes for the microbenchmarks (up to 1000000)")
+    parser.add_argument('--dimensions', type=int, default=384)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-http', action='store_true')
+    parser.add_argument('--http-catalog-size', type=int, default=10000)
+    parser.add_argument('--endpoints', nargs='+', default=['search', 'query', 'followup'])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--asgi', action='store_true', help="Serve asgi:app with Uvicorn workers instead of wsgi:app")
+    parser.add_argument('--llm-delay', type=float, default=0.2, help="Latency injected by the fake LLM in seconds")
+    parser.add_argument('--startup-timeout', type=float, default=120.0)
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    parser.add_argument('--baseline', help="Results JSON from an earlier run to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed relative regression against the baseline before failing")
+    args = parser.parse_args()
+
+    report = {"environment": environment(), "config": vars(args), "results": []}
+    if not args.skip_micro:
+        report["results"].extend(run_microbenchmarks(args.sizes, args.dimensions, args.repeat, args.seed))
+    if not args.skip_http:
+        http = run_http_benchmarks(args)
+        report["results"].extend(http["results"])
+        report["serverMetrics"] = http["serverMetrics"]
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report["regressions"] = compare(report["results"], json.load(f)["results"], args.tolerance)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    print(f"{'benchmark':<26}{'size':>10}{'value':>14}  unit")
+    for row in report["results"]:
+        print(f"{row['name']:<26}{row['size']:>10}{row['value']:>14.3f}  {row['unit']}")
+
+    regressions = report.get("regressions", [])
+    for row in regressions:
+        print(f"REGRESSION {row['name']} @ {row['size']}: {row['value']:.3f} {row['unit']} "
+              f"(baseline {row['baseline']:.3f}, tolerance {args.tolerance:.0%})")
+    if regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
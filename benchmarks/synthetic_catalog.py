@@ -0,0 +1,83 @@
+import argparse
+import json
+import random
+from typing import Any, Dict, Iterator, List
+
+BRANDS = ["Acer", "Dell", "ASUS", "MSI", "Lenovo", "HP", "Razer", "Gigabyte", "Samsung", "Apple"]
+CATEGORIES = {
+    "Laptops": ["Nitro", "G15", "TUF Gaming", "GF63 Thin", "IdeaPad", "Pavilion", "Blade", "Aero", "Galaxy Book", "MacBook"],
+    "Smartphones": ["Galaxy", "Pixel", "Edge", "Zenfone", "Nord", "Xperia", "iPhone", "Moto", "Redmi", "Find"],
+    "Tablets": ["Tab", "iPad", "MatePad", "Surface", "Fire", "Yoga Tab", "Pad", "Slate", "Note", "Chromebook Tablet"],
+    "Monitors": ["Odyssey", "UltraSharp", "ROG Swift", "Optix", "Legion", "Omen", "Predator", "Aorus", "ViewFinity", "Studio Display"],
+}
+PROCESSORS = ["Intel Core i5-11400H", "Intel Core i7-11800H", "AMD Ryzen 5 5600H", "AMD Ryzen 7 5800H", "Apple M2", "Snapdragon 8 Gen 2"]
+GRAPHICS = ["NVIDIA GeForce GTX 1650", "NVIDIA GeForce RTX 3050", "NVIDIA GeForce RTX 3060", "NVIDIA GeForce RTX 4070", "AMD Radeon RX 6600M"]
+USES = ["gaming", "video editing", "students", "office work", "travel", "photography", "programming"]
+
+def make_product(product_id: int, rng: random.Random) -> Dict[str, Any]:
+    category = rng.choice(list(CATEGORIES))
+    brand = rng.choice(BRANDS)
+    name = f"{brand} {rng.choice(CATEGORIES[category])} {rng.randint(1, 9)}{rng.choice(['', ' Pro', ' Plus', ' Max'])}"
+    processor = rng.choice(PROCESSORS)
+    graphics = rng.choice(GRAPHICS)
+    memory = rng.choice([4, 8, 16, 32, 64])
+    storage = rng.choice([128, 256, 512, 1024, 2048])
+    refresh = rng.choice([60, 90, 120, 144, 165, 240])
+    battery = rng.randint(4, 20)
+    price = round(rng.uniform(149, 2999), 2)
+    use = rng.choice(USES)
+
+    return {
+        "id": product_id,
+        "name": name,
+        "description": f"{category[:-1]} with {processor}, {graphics}, {memory}GB RAM, {storage}GB SSD and a {refresh}Hz display",
+        "price": price,
+        "originalPrice": round(price * rng.uniform(1.0, 1.3), 2) if rng.random() < 0.7 else None,
+        "imageUrl": None,
+        "rating": round(rng.uniform(3.0, 5.0), 1),
+        "reviewCount": rng.randint(0, 5000),
+        "category": category,
+        "specs": {
+            "processor": f"{processor} ({rng.choice([4, 6, 8, 12])} cores, up to {rng.choice([3.8, 4.2, 4.5, 4.9])}GHz)",
+            "storage": f"{storage}GB NVMe SSD" if storage < 1024 else f"{storage // 1024}TB NVMe SSD",
+            "memory": f"{memory}GB DDR4 RAM",
+            "graphics": f"{graphics} ({rng.choice([4, 6, 8, 12])}GB GDDR6)",
+            "display": f"{rng.choice([13.3, 14, 15.6, 16, 17.3])}\" FHD (1920 x 1080) {refresh}Hz",
+            "battery": f"Up to {battery} hours battery life"
+        },
+        "recommendation": f"The {name} is a good fit for {use} thanks to its {processor} and {memory}GB of memory."
+    }
+
+def iter_products(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for product_id in range(1, count + 1):
+        yield make_product(product_id, rng)
+
+def iter_product_chunks(count: int, chunk_size: int = 10000, seed: int = 0) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for product in iter_products(count, seed):
+        chunk.append(product)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def write_jsonl(path: str, count: int, seed: int = 0) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        for product in iter_products(count, seed):
+            f.write(json.dumps(product))
+            f.write('\n')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic product catalog as JSONL")
+    parser.add_argument('output')
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    write_jsonl(args.output, args.size, args.seed)
+    print(f"Wrote {args.size} products to {args.output}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,196 @@
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import math
+import os
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+CATALOG_CHUNK_SIZE = 10000
+
+class LoadProgress:
+
+    def __init__(self, label: str, total: Optional[int] = None, report_interval_seconds: float = 5.0):
+        self.label = label
+        self.total = total
+        self.report_interval_seconds = report_interval_seconds
+        self.rows = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def update(self, rows: int) -> None:
+        self.rows += rows
+        now = time.perf_counter()
+        if now - self._last_report >= self.report_interval_seconds:
+            self._last_report = now
+            print(self.summary())
+
+    def finish(self) -> Dict[str, Any]:
+        print(self.summary())
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "rows": self.rows,
+            "elapsedSeconds": elapsed,
+            "rowsPerSecond": self.rows / elapsed if elapsed > 0 else 0.0,
+            "peakRssMb": peak_rss_mb()
+        }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        progress = f"{self.rows}/{self.total}" if self.total else f"{self.rows}"
+        rss = f", peak RSS {stats['peakRssMb']:.0f} MB" if stats['peakRssMb'] is not None else ''
+        return (f"{self.label}: {progress} rows in {stats['elapsedSeconds']:.1f}s "
+                f"({stats['rowsPerSecond']:.0f} rows/s{rss})")
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def iter_product_chunks(path: str, chunk_size: int = CATALOG_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    invalid = 0
+    for records in _iter_record_chunks(path, chunk_size):
+        chunk = []
+        for record in records:
+            try:
+                chunk.append(validate_product(record))
+            except ValueError as e:
+                invalid += 1
+                if invalid <= 10:
+                    print(f"Skipping invalid product record in {path}: {e}")
+        if chunk:
+            yield chunk
+
+    if invalid:
+        print(f"Skipped {invalid} invalid product records in {path}")
+
+def iter_products(path: str, chunk_size: int = CATALOG_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    progress = LoadProgress(f"Loading catalog {os.path.basename(path)}")
+    for chunk in iter_product_chunks(path, chunk_size):
+        yield from chunk
+        progress.update(len(chunk))
+    progress.finish()
+
+def load_catalog(path: str, catalog: Any, chunk_size: int = CATALOG_CHUNK_SIZE) -> Dict[str, Any]:
+    progress = LoadProgress(f"Loading catalog {os.path.basename(path)}")
+    for chunk in iter_product_chunks(path, chunk_size):
+        catalog.extend(chunk)
+        progress.update(len(chunk))
+    return progress.finish()
+
+def validate_product(record: Any) -> Dict[str, Any]:
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+
+    record = {key: value for key, value in record.items() if not _is_missing(value)}
+
+    try:
+        product_id = int(record['id'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"missing or invalid id: {record.get('id')!r}")
+
+    name = record.get('name')
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError(f"product {product_id} has no name")
+
+    specs = record.get('specs') or {}
+    if isinstance(specs, str):
+        try:
+            specs = json.loads(specs)
+        except ValueError:
+            raise ValueError(f"product {product_id} has invalid specs JSON")
+    if isinstance(specs, list):
+        try:
+            specs = dict(specs)
+        except (TypeError, ValueError):
+            raise ValueError(f"product {product_id} has invalid specs")
+    if not isinstance(specs, dict):
+        raise ValueError(f"product {product_id} has invalid specs")
+    for key, value in record.items():
+        if key.startswith('specs.'):
+            specs[key[len('specs.'):]] = value
+
+    return {
+        "id": product_id,
+        "name": name.strip(),
+        "description": str(record.get('description', '')),
+        "price": _number(record, 'price', product_id, 0.0),
+        "originalPrice": _number(record, 'originalPrice', product_id, None),
+        "imageUrl": record.get('imageUrl'),
+        "rating": _number(record, 'rating', product_id, 0.0),
+        "reviewCount": int(_number(record, 'reviewCount', product_id, 0)),
+        "category": str(record.get('category', '')),
+        "specs": {str(key): str(value) for key, value in specs.items() if not _is_missing(value)},
+        "recommendation": str(record.get('recommendation', ''))
+    }
+
+def _iter_record_chunks(path: str, chunk_size: int) -> Iterator[List[Any]]:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return _iter_jsonl(path, chunk_size)
+    if extension == '.csv':
+        return _iter_csv(path, chunk_size)
+    if extension in ('.parquet', '.pq'):
+        return _iter_parquet(path, chunk_size)
+    raise ValueError(f"Unsupported catalog format: {path}")
+
+def _iter_jsonl(path: str, chunk_size: int) -> Iterator[List[Any]]:
+    chunk = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                chunk.append(json.loads(line))
+            except ValueError:
+                chunk.append(None)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def _iter_csv(path: str, chunk_size: int) -> Iterator[List[Any]]:
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError("pandas is required to load CSV catalogs") from e
+
+    for frame in pd.read_csv(path, chunksize=chunk_size, dtype={"id": str}):
+        yield frame.to_dict('records')
+
+def _iter_parquet(path: str, chunk_size: int) -> Iterator[List[Any]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow is required to load Parquet catalogs") from e
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+def _number(record: Dict[str, Any], key: str, product_id: int, default: Optional[float]) -> Optional[float]:
+    value = record.get(key)
+    if value is None or value == '':
+        return default
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"product {product_id} has invalid {key}: {value!r}")
+    if not math.isfinite(value):
+        raise ValueError(f"product {product_id} has invalid {key}: {value!r}")
+    return value
+
+def _is_missing(value: Any) -> bool:
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except (TypeError, ValueError):
+        return False
\ No newline at end of file
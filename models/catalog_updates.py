@@ -0,0 +1,127 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import threading
+import time
+from .catalog_loader import validate_product
+
+def parse_catalog_delta(lines: Iterable[str]) -> List[Tuple[str, Any]]:
+    operations = []
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            operation = parse_delta_line(line)
+        except ValueError as e:
+            raise ValueError(f"Line {line_number}: {e}")
+        if operation is not None:
+            operations.append(operation)
+    return operations
+
+def parse_delta_line(line: str) -> Optional[Tuple[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        record = json.loads(line)
+    except ValueError:
+        raise ValueError("invalid JSON")
+    if not isinstance(record, dict):
+        raise ValueError("expected an object")
+
+    op = record.get('op', 'upsert')
+    if op == 'delete':
+        try:
+            return ('delete', int(record['id']))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"missing or invalid id: {record.get('id')!r}")
+    if op == 'upsert':
+        return ('upsert', validate_product(record.get('product', record)))
+    raise ValueError(f"unknown op '{op}'")
+
+def apply_catalog_delta(rag_service: Any, operations: List[Tuple[str, Any]]) -> Dict[str, int]:
+    summary = {"upserted": 0, "reembedded": 0, "deleted": 0}
+
+    start = 0
+    while start < len(operations):
+        op = operations[start][0]
+        end = start
+        while end < len(operations) and operations[end][0] == op:
+            end += 1
+        batch = [payload for _, payload in operations[start:end]]
+
+        if op == 'upsert':
+            result = rag_service.upsert_products(batch)
+            summary["upserted"] += result["upserted"]
+            summary["reembedded"] += result["reembedded"]
+        else:
+            summary["deleted"] += rag_service.delete_products(batch)
+        start = end
+
+    return summary
+
+class CatalogDeltaWatcher:
+
+    def __init__(self, path: str, rag_service: Any, interval_seconds: float = 2.0):
+        self.path = path
+        self.rag_service = rag_service
+        self.interval_seconds = interval_seconds
+
+        self._offset = 0
+        self._inode = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='catalog-delta-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def poll(self) -> Optional[Dict[str, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._inode = stat.st_ino
+            self._offset = 0
+        if stat.st_size == self._offset:
+            return None
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return None
+
+        operations = []
+        position = self._offset
+        for line in data[:end].splitlines(keepends=True):
+            try:
+                operation = parse_delta_line(line.decode('utf-8'))
+            except ValueError as e:
+                print(f"Skipping invalid catalog delta record at byte {position} of {self.path}: {e}")
+                operation = None
+            if operation is not None:
+                operations.append(operation)
+            position += len(line)
+
+        started = time.perf_counter()
+        summary = apply_catalog_delta(self.rag_service, operations)
+        self._offset += end
+        print(f"Applied catalog delta from {self.path} in {time.perf_counter() - started:.3f}s: {summary}")
+        return summary
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error applying catalog delta from {self.path}: {e}")
+            self._stop.wait(self.interval_seconds)
\ No newline at end of file
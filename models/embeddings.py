@@ -0,0 +1,124 @@
+from typing import List, Optional
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+class EmbeddingProvider:
+
+    model_id = 'base'
+    dimensions = 0
+    semantic = False
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        return self.embed(queries)
+
+class HashEmbeddingProvider(EmbeddingProvider):
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+        self.model_id = f"hash-sine-{dimensions}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        from .vector_db import embed_batch
+        return embed_batch(texts, self.dimensions)
+
+class SentenceTransformerProvider(EmbeddingProvider):
+
+    semantic = True
+
+    def __init__(self, model_path: str, batch_size: int = 64, device: str = 'cpu'):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("sentence-transformers is required to load a local embedding model") from e
+
+        self.model = SentenceTransformer(model_path, device=device)
+        self.batch_size = batch_size
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        self.model_id = f"sentence-transformers:{os.path.basename(os.path.normpath(model_path))}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return embeddings.astype(np.float32)
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+
+    def __init__(self, provider: EmbeddingProvider, cache_dir: str):
+        self.provider = provider
+        self.model_id = provider.model_id
+        self.dimensions = provider.dimensions
+        self.semantic = provider.semantic
+        self.cache_dir = os.path.join(cache_dir, hashlib.sha256(self.model_id.encode('utf-8')).hexdigest()[:16])
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+
+        missing = []
+        for i, text in enumerate(texts):
+            cached = self._read(self._path(text))
+            if cached is None:
+                missing.append(i)
+            else:
+                embeddings[i] = cached
+
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            computed = self.provider.embed([texts[i] for i in missing])
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+                self._write(self._path(texts[i]), embedding)
+
+        return embeddings
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        return self.provider.embed_queries(queries)
+
+    def _path(self, text: str) -> str:
+        key = hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npy")
+
+    def _read(self, path: str) -> Optional[np.ndarray]:
+        try:
+            embedding = np.load(path)
+        except (OSError, ValueError):
+            return None
+        return embedding if embedding.shape == (self.dimensions,) else None
+
+    def _write(self, path: str, embedding: np.ndarray) -> None:
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, staging = tempfile.mkstemp(dir=directory, suffix='.npy')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.asarray(embedding, dtype=np.float32))
+            os.replace(staging, path)
+        except OSError as e:
+            print(f"Error writing embedding cache entry {path}: {e}")
+
+def setup_embedding_provider(model_path: Optional[str] = None, cache_dir: Optional[str] = None, dimensions: Optional[int] = None) -> EmbeddingProvider:
+    model_path = model_path or os.getenv('EMBEDDING_MODEL_PATH')
+    cache_dir = cache_dir or os.getenv('EMBEDDING_CACHE_DIR')
+
+    provider = SentenceTransformerProvider(model_path) if model_path else HashEmbeddingProvider(dimensions or 384)
+
+    if cache_dir:
+        provider = CachedEmbeddingProvider(provider, cache_dir)
+
+    return provider
\ No newline at end of file
@@ -0,0 +1,139 @@
+from typing import List, Optional, Set, Tuple
+import re
+import numpy as np
+from .product_store import ProductStore
+
+FOLLOWUP_QUESTIONS = [
+    ("gpuMemoryGb", ("vram", "video memory", "gpu memory", "graphics memory"),
+     ("the most video memory", "the least video memory"), "{:g}GB of video memory"),
+    ("batteryHours", ("battery",), ("the longest battery life", "the shortest battery life"), "up to {:g} hours"),
+    ("memoryGb", ("ram", "memory"), ("the most memory", "the least memory"), "{:g}GB of RAM"),
+    ("storageGb", ("storage", "ssd", "disk", "space"), ("the most storage", "the least storage"), "{:g}GB of storage"),
+    ("cpuCores", ("cores", "core count", "cpu cores"), ("the most CPU cores", "the fewest CPU cores"), "{:g} cores"),
+    ("cpuGhz", ("processor", "cpu", "clock", "ghz"), ("the fastest processor", "the slowest processor"), "up to {:g}GHz"),
+    ("refreshHz", ("refresh", "hz", "smoothest"), ("the highest refresh rate", "the lowest refresh rate"), "{:g}Hz"),
+    ("rating", ("rated", "rating", "reviews", "reviewed"), ("the highest rating", "the lowest rating"), "{:g}/5"),
+    ("price", ("cheap", "cheapest", "cheaper", "price", "priced", "expensive", "inexpensive", "affordable", "budget",
+               "cost", "costs"),
+     ("the highest price", "the lowest price"), "${:,.2f}"),
+]
+
+HIGHER_CUES = {"most", "best", "highest", "longest", "largest", "biggest", "fastest", "greatest",
+               "maximum", "max", "top", "expensive", "smoothest"}
+LOWER_CUES = {"least", "lowest", "fewest", "smallest", "shortest", "cheapest", "cheaper", "slowest",
+              "minimum", "min", "cheap", "inexpensive", "affordable", "budget", "worst"}
+
+FILLER_WORDS = {"the", "of", "amount"}
+CUE_WINDOW = 2
+
+KEYWORDS = sorted(
+    ((tuple(keyword.split()), attribute) for attribute, keywords, _, _ in FOLLOWUP_QUESTIONS for keyword in keywords),
+    key=lambda item: -len(item[0])
+)
+
+def classify_followup(query: str) -> Optional[Tuple[str, bool]]:
+    words = re.findall(r"[a-z0-9]+", query.lower())
+    comparatives = {"more", "less"} if "which" in words else set()
+
+    # Every attribute the query names must be modified by a cue, otherwise the question is about something else.
+    questions = set()
+    for attribute, start, end in _keyword_mentions(words):
+        higher = _direction(words, start, end, comparatives)
+        if higher is None:
+            return None
+        questions.add((attribute, higher))
+
+    if len(questions) != 1:
+        return None
+    return questions.pop()
+
+def _keyword_mentions(words: List[str]) -> List[Tuple[str, int, int]]:
+    mentions = []
+    i = 0
+    while i < len(words):
+        for keyword, attribute in KEYWORDS:
+            if tuple(words[i:i + len(keyword)]) == keyword:
+                mentions.append((attribute, i, i + len(keyword)))
+                i += len(keyword)
+                break
+        else:
+            i += 1
+    return mentions
+
+def _direction(words: List[str], start: int, end: int, comparatives: Set[str]) -> Optional[bool]:
+    own = _polarity(words[start], set()) if end - start == 1 else None
+
+    before = range(start - 1, max(-1, start - CUE_WINDOW - 2), -1)
+    after = range(end, min(len(words), end + CUE_WINDOW + 1))
+
+    modifier = None
+    for positions in (before, after):
+        for i in positions:
+            modifier = _polarity(words[i], comparatives)
+            if modifier is not None or words[i] not in FILLER_WORDS:
+                break
+        if modifier is not None:
+            break
+
+    if modifier is None:
+        return own
+    if own is None:
+        return modifier
+    return own if modifier else not own
+
+def _polarity(word: str, comparatives: Set[str]) -> Optional[bool]:
+    if word in HIGHER_CUES or (word == "more" and word in comparatives):
+        return True
+    if word in LOWER_CUES or (word == "less" and word in comparatives):
+        return False
+    return None
+
+class FollowupEngine:
+
+    def __init__(self, store: ProductStore):
+        self.store = store
+
+    def answer(self, query: str, product_ids: List[int]) -> Optional[str]:
+        question = classify_followup(query)
+        if question is None or not product_ids:
+            return None
+        attribute, higher = question
+
+        rows = self.store.rows_for_ids(np.asarray(product_ids, dtype=np.int64))
+        rows = rows[rows >= 0]
+        values = self._column(attribute)[rows].astype(np.float64)
+
+        known = ~np.isnan(values)
+        if not known.any():
+            return None
+        rows, values = rows[known], values[known]
+
+        order = np.argsort(-values if higher else values, kind='stable')
+        rows, values = rows[order], values[order]
+
+        _, _, labels, value_format = next(q for q in FOLLOWUP_QUESTIONS if q[0] == attribute)
+        label = labels[0] if higher else labels[1]
+
+        winners = [self.store.field(row, 'name') for row, value in zip(rows.tolist(), values) if value == values[0]]
+        verb = "has" if len(winners) == 1 else "have"
+        response = (f"Among the products from your search, {_join_names(winners)} {verb} {label}, "
+                    f"with {value_format.format(values[0])}.")
+
+        runner_up = np.flatnonzero(values != values[0])
+        if runner_up.size:
+            row = int(rows[runner_up[0]])
+            response += f" Next is the {self.store.field(row, 'name')} with {value_format.format(values[runner_up[0]])}."
+        return response
+
+    def _column(self, attribute: str) -> np.ndarray:
+        if attribute == 'price':
+            return self.store.prices
+        if attribute == 'rating':
+            return self.store.ratings
+        return self.store.attributes[attribute]
+
+def _join_names(names: List[str]) -> str:
+    names = [f"the {name}" for name in names]
+    if len(names) == 1:
+        return names[0]
+    return f"{', '.join(names[:-1])} and {names[-1]}"
\ No newline at end of file
@@ -0,0 +1,208 @@
+from typing import List, Optional
+import json
+import os
+import threading
+import numpy as np
+from .vector_db import VectorDb, VectorSearchMatch
+from .embeddings import EmbeddingProvider
+
+class IVFVectorDb(VectorDb):
+
+    def __init__(self, dimensions: Optional[int] = None, initial_capacity: int = 64,
+                 embedding_provider: Optional[EmbeddingProvider] = None, nlist: Optional[int] = None,
+                 nprobe: int = 8, train_iterations: int = 10, min_train_size: int = 1024,
+                 max_train_sample: int = 100000, seed: int = 0):
+        super().__init__(dimensions, initial_capacity, embedding_provider)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_iterations = train_iterations
+        self.min_train_size = min_train_size
+        self.max_train_sample = max_train_sample
+        self.seed = seed
+
+        self._centroids = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._list_rows = np.zeros(0, dtype=np.int64)
+        self._list_offsets = np.zeros(1, dtype=np.int64)
+        self._trained_size = 0
+        self._assigned_size = 0
+        self._lists_size = 0
+        self._index_lock = threading.RLock()
+
+    def build_index(self) -> None:
+        with self._index_lock:
+            if self._snapshot.size:
+                self._train()
+
+    def _train(self) -> None:
+        snapshot = self._snapshot
+        vectors = snapshot.matrix[:snapshot.size]
+        nlist = self._target_nlist(snapshot.size)
+        rng = np.random.default_rng(self.seed)
+
+        sample = vectors
+        if snapshot.size > self.max_train_sample:
+            sample = vectors[rng.choice(snapshot.size, self.max_train_sample, replace=False)]
+
+        centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            labels = _nearest_centroids(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+
+            empty = np.flatnonzero(counts == 0)
+            if empty.size:
+                sums[empty] = sample[rng.choice(sample.shape[0], empty.size, replace=False)]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.where(norms > 0, norms, 1)
+
+        self._centroids = centroids.astype(np.float32)
+        self._assignments = np.zeros(snapshot.matrix.shape[0], dtype=np.int32)
+        self._trained_size = snapshot.size
+        self._assigned_size = 0
+        self._lists_size = -1
+        self._refresh_lists()
+
+    def similarity_search(self, query_vector: np.ndarray, limit: int = 5, score_threshold: float = 0.5,
+                          rows: Optional[np.ndarray] = None) -> List[VectorSearchMatch]:
+        if self._snapshot.size < self.min_train_size or rows is not None:
+            return super().similarity_search(query_vector, limit, score_threshold, rows)
+        if limit <= 0:
+            return []
+
+        with self._index_lock:
+            self._ensure_index()
+            snapshot = self._snapshot
+            centroids, list_rows, list_offsets = self._centroids, self._list_rows, self._list_offsets
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        centroid_scores = centroids @ query
+        nprobe = min(self.nprobe, centroid_scores.shape[0])
+        probes = np.argpartition(centroid_scores, -nprobe)[-nprobe:]
+
+        rows = np.concatenate([
+            list_rows[list_offsets[c]:list_offsets[c + 1]] for c in probes
+        ])
+        if rows.size == 0:
+            return []
+
+        scores = snapshot.matrix[rows] @ query
+        return self._top_k(scores, limit, score_threshold, rows, snapshot)
+
+    def similarity_search_batch(self, query_matrix: np.ndarray, limit: int = 5, score_threshold: float = 0.5,
+                                rows: Optional[np.ndarray] = None) -> List[List[VectorSearchMatch]]:
+        if self._snapshot.size < self.min_train_size or rows is not None:
+            return super().similarity_search_batch(query_matrix, limit, score_threshold, rows)
+
+        queries = np.atleast_2d(np.asarray(query_matrix, dtype=np.float32))
+        return [self.similarity_search(query, limit, score_threshold) for query in queries]
+
+    def _replace_rows(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        super()._replace_rows(rows, vectors)
+        with self._index_lock:
+            if self._centroids is None:
+                return
+
+            assigned = rows[rows < self._assigned_size]
+            if assigned.size:
+                self._assignments[assigned] = _nearest_centroids(self._snapshot.matrix[assigned], self._centroids)
+                self._lists_size = -1
+
+    def _publish(self, snapshot, keep: Optional[np.ndarray] = None) -> None:
+        # Swap vectors and remap the lists under one lock so a search never pairs old lists with new rows.
+        with self._index_lock:
+            super()._publish(snapshot, keep)
+            if keep is None or self._centroids is None:
+                return
+
+            self._assigned_size = int(np.searchsorted(keep, self._assigned_size))
+            self._assignments = self._assignments[keep[:self._assigned_size]]
+            self._lists_size = -1
+
+    def _reset_index(self) -> None:
+        with self._index_lock:
+            self._centroids = None
+            self._assigned_size = 0
+            self._lists_size = 0
+            if self._snapshot.size >= self.min_train_size:
+                self._train()
+
+    def _save_index(self, path: str) -> None:
+        with self._index_lock:
+            if self._centroids is None:
+                return
+            size = self._snapshot.size
+            if self._lists_size != size:
+                self._refresh_lists()
+
+            np.save(os.path.join(path, 'centroids.npy'), self._centroids)
+            np.save(os.path.join(path, 'assignments.npy'), self._assignments[:size])
+            with open(os.path.join(path, 'ivf.json'), 'w') as f:
+                json.dump({"trainedSize": self._trained_size}, f)
+
+    def _load_index(self, path: str) -> bool:
+        try:
+            with open(os.path.join(path, 'ivf.json')) as f:
+                meta = json.load(f)
+            centroids = np.load(os.path.join(path, 'centroids.npy'))
+            assignments = np.load(os.path.join(path, 'assignments.npy'))
+        except (OSError, ValueError):
+            return False
+
+        size = self._snapshot.size
+        if (centroids.ndim != 2 or centroids.shape[1] != self.dimensions or assignments.shape != (size,)
+                or (assignments.size and assignments.max() >= centroids.shape[0])):
+            return False
+
+        with self._index_lock:
+            self._centroids = centroids.astype(np.float32)
+            self._assignments = assignments.astype(np.int32)
+            self._trained_size = int(meta.get('trainedSize', size))
+            self._assigned_size = size
+            self._lists_size = -1
+            self._refresh_lists()
+        return True
+
+    def _ensure_index(self) -> None:
+        size = self._snapshot.size
+        if self._centroids is None or size > 2 * self._trained_size:
+            self._train()
+        elif self._lists_size != size:
+            self._refresh_lists()
+
+    def _refresh_lists(self) -> None:
+        snapshot = self._snapshot
+        size = snapshot.size
+        if self._assignments.shape[0] < snapshot.matrix.shape[0]:
+            assignments = np.zeros(snapshot.matrix.shape[0], dtype=np.int32)
+            assignments[:self._assigned_size] = self._assignments[:self._assigned_size]
+            self._assignments = assignments
+
+        if self._assigned_size < size:
+            pending = snapshot.matrix[self._assigned_size:size]
+            self._assignments[self._assigned_size:size] = _nearest_centroids(pending, self._centroids)
+            self._assigned_size = size
+
+        assignments = self._assignments[:size]
+        self._list_rows = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=self._centroids.shape[0])
+        self._list_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._lists_size = size
+
+    def _target_nlist(self, size: int) -> int:
+        if self.nlist:
+            return max(1, min(self.nlist, size))
+        return max(1, min(int(4 * np.sqrt(size)), size))
+
+def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+    labels = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], chunk_size):
+        chunk = vectors[start:start + chunk_size]
+        labels[start:start + chunk.shape[0]] = np.argmax(chunk @ centroids.T, axis=1)
+    return labels
\ No newline at end of file
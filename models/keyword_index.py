@@ -0,0 +1,169 @@
+from typing import Dict, List, Tuple
+from array import array
+import math
+import re
+import threading
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-.][a-z0-9]+)*")
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if '-' in token or '.' in token:
+            tokens.extend(part for part in re.split(r"[-.]", token) if part)
+    return tokens
+
+class KeywordIndex:
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        self._term_ids = {}
+        self._ids = array('q')
+        self._doc_lengths = array('f')
+        self._live = bytearray()
+        self._row_by_id = {}
+        self._posting_terms = array('l')
+        self._posting_rows = array('l')
+        self._posting_tfs = array('f')
+        self._lock = threading.Lock()
+
+        self._dirty = False
+        self._removed = False
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.float32)
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._doc_ids = np.zeros(0, dtype=np.int64)
+        self._doc_count = 0
+        self._average_length = 0.0
+
+    def add_documents(self, product_ids: List[int], texts: List[str]) -> None:
+        with self._lock:
+            for product_id, text in zip(product_ids, texts):
+                self._remove(product_id)
+                row = len(self._ids)
+                counts = {}
+                tokens = tokenize(text)
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+
+                for token, count in counts.items():
+                    term_id = self._term_ids.setdefault(token, len(self._term_ids))
+                    self._posting_terms.append(term_id)
+                    self._posting_rows.append(row)
+                    self._posting_tfs.append(count)
+
+                self._ids.append(product_id)
+                self._doc_lengths.append(len(tokens))
+                self._live.append(1)
+                self._row_by_id[product_id] = row
+            self._dirty = True
+
+    def remove_documents(self, product_ids: List[int]) -> int:
+        with self._lock:
+            removed = sum(self._remove(product_id) for product_id in product_ids)
+            if removed:
+                self._dirty = True
+            return removed
+
+    def search(self, query: str, limit: int = 50) -> List[Tuple[int, float]]:
+        term_ids = {self._term_ids[token] for token in tokenize(query) if token in self._term_ids}
+        if not term_ids or limit <= 0:
+            return []
+
+        with self._lock:
+            self._compact()
+            offsets, rows, tfs, lengths, ids = self._offsets, self._rows, self._tfs, self._lengths, self._doc_ids
+            doc_count, average_length = self._doc_count, self._average_length
+
+        candidate_rows = []
+        candidate_scores = []
+        for term_id in term_ids:
+            start, end = offsets[term_id], offsets[term_id + 1]
+            if start == end:
+                continue
+            postings = rows[start:end]
+            term_tfs = tfs[start:end]
+            df = postings.shape[0]
+
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[postings] / average_length)
+            candidate_rows.append(postings)
+            candidate_scores.append(idf * term_tfs * (self.k1 + 1) / (term_tfs + norm))
+        if not candidate_rows:
+            return []
+
+        unique_rows, inverse = np.unique(np.concatenate(candidate_rows), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(candidate_scores))
+
+        if scores.shape[0] > limit:
+            top = np.argpartition(scores, -limit)[-limit:]
+        else:
+            top = np.arange(scores.shape[0])
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [(int(ids[unique_rows[i]]), float(scores[i])) for i in top]
+
+    def get_size(self) -> int:
+        return len(self._row_by_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {"documents": len(self._row_by_id), "terms": len(self._term_ids),
+                "postings": self._rows.shape[0] + len(self._posting_rows)}
+
+    def _remove(self, product_id: int) -> bool:
+        row = self._row_by_id.pop(product_id, None)
+        if row is None:
+            return False
+        self._live[row] = 0
+        self._removed = True
+        return True
+
+    def _compact(self) -> None:
+        if not self._dirty:
+            return
+
+        live = np.frombuffer(bytes(self._live), dtype=np.uint8).astype(bool)
+        rows, tfs = self._rows, self._tfs
+        offsets = np.concatenate([
+            self._offsets,
+            np.full(len(self._term_ids) + 1 - self._offsets.shape[0], self._offsets[-1], dtype=np.int64)
+        ])
+        if self._removed:
+            keep = live[rows]
+            offsets = np.concatenate([[0], np.cumsum(keep, dtype=np.int64)])[offsets]
+            rows, tfs = rows[keep], tfs[keep]
+
+        terms = np.array(self._posting_terms, dtype=np.int64)
+        new_rows = np.array(self._posting_rows, dtype=np.int32)
+        new_tfs = np.array(self._posting_tfs, dtype=np.float32)
+        keep = live[new_rows]
+        order = np.argsort(terms[keep], kind='stable')
+        terms = terms[keep][order]
+        positions = offsets[terms + 1]
+        self._rows = np.insert(rows, positions, new_rows[keep][order])
+        self._tfs = np.insert(tfs, positions, new_tfs[keep][order])
+        counts = np.bincount(terms, minlength=len(self._term_ids))
+        self._offsets = offsets + np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        self._lengths = np.array(self._doc_lengths, dtype=np.float32)
+        self._doc_ids = np.array(self._ids, dtype=np.int64)
+        self._doc_count = int(live.sum())
+        self._average_length = float(self._lengths[live].mean()) if self._doc_count else 0.0
+
+        self._posting_terms = array('l')
+        self._posting_rows = array('l')
+        self._posting_tfs = array('f')
+        self._removed = False
+        self._dirty = False
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> Dict[int, float]:
+    fused = {}
+    for ranking in rankings:
+        for rank, product_id in enumerate(ranking, start=1):
+            fused[product_id] = fused.get(product_id, 0.0) + 1.0 / (k + rank)
+    return fused
\ No newline at end of file
@@ -0,0 +1,244 @@
+from typing import Any, Dict, List, Optional, Tuple
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+
+LATENCY_BUCKETS = tuple(round(0.0001 * 1.5 ** i, 6) for i in range(34))
+
+METRIC_HELP = {
+    "rag_request_seconds": "End-to-end latency of RAG service operations",
+    "rag_stage_seconds": "Latency of individual RAG pipeline stages",
+    "cache_requests_total": "Response and semantic cache lookups by result",
+    "llm_fallbacks_total": "LLM calls replaced by the template fallback",
+    "followup_answers_total": "Follow-up answers by source",
+}
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts: List[int], total: float) -> None:
+        for i, count in enumerate(counts):
+            self.counts[i] += count
+        self.sum += total
+        self.count += sum(counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.bounds[-1]
+
+class Span:
+    __slots__ = ('_registry', '_key', '_started')
+
+    def __init__(self, registry: 'MetricsRegistry', key: Tuple):
+        self._registry = registry
+        self._key = key
+
+    def __enter__(self) -> 'Span':
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._registry._observe_key(self._key, time.perf_counter() - self._started)
+
+class _NoopSpan:
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class MetricsRegistry:
+
+    def __init__(self, enabled: bool = True, directory: Optional[str] = None, flush_interval_seconds: float = 5.0):
+        self.enabled = enabled
+        self.directory = directory
+        self.flush_interval_seconds = flush_interval_seconds
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+        self._ensure_flusher()
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        if self.enabled:
+            self._observe_key((name, tuple(sorted(labels.items()))), value)
+
+    def timer(self, name: str, **labels: str) -> Any:
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, (name, tuple(sorted(labels.items()))))
+
+    def span(self, stage: str) -> Any:
+        return self.timer('rag_stage_seconds', stage=stage)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": [[name, dict(labels), value] for (name, labels), value in self._counters.items()],
+                "histograms": [
+                    [name, dict(labels), histogram.counts[:], histogram.sum]
+                    for (name, labels), histogram in self._histograms.items()
+                ]
+            }
+
+    def collect(self) -> Tuple[Dict[Tuple, float], Dict[Tuple, Histogram]]:
+        snapshots = [self.snapshot()]
+        if self.directory:
+            self.flush()
+            snapshots = []
+            for path in sorted(glob.glob(os.path.join(self.directory, 'metrics-*.json'))):
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError) as e:
+                    print(f"Skipping unreadable metrics file {path}: {e}")
+
+        counters = {}
+        histograms = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(sorted(labels.items())))
+                counters[key] = counters.get(key, 0.0) + value
+            for name, labels, counts, total in snapshot['histograms']:
+                key = (name, tuple(sorted(labels.items())))
+                histograms.setdefault(key, Histogram()).merge(counts, total)
+        return counters, histograms
+
+    def render_prometheus(self) -> str:
+        counters, histograms = self.collect()
+        lines = []
+        seen = set()
+
+        def header(name: str, metric_type: str) -> None:
+            if name not in seen:
+                seen.add(name)
+                if name in METRIC_HELP:
+                    lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name, 'counter')
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+        for (name, labels), histogram in sorted(histograms.items()):
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + (float('inf'),), histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> Dict[str, Any]:
+        counters, histograms = self.collect()
+        return {
+            "enabled": self.enabled,
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+            "latency": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "mean": histogram.sum / histogram.count if histogram.count else None,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99)
+                }
+                for (name, labels), histogram in sorted(histograms.items())
+            ]
+        }
+
+    def flush(self) -> None:
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _observe_key(self, key: Tuple, value: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+        self._ensure_flusher()
+
+    def _ensure_flusher(self) -> None:
+        if self.directory and self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self.flush_interval_seconds)
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Error writing metrics to {self.directory}: {e}")
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._flusher = None
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels) + '}'
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def setup_metrics() -> MetricsRegistry:
+    return MetricsRegistry(
+        enabled=os.getenv('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no'),
+        directory=os.getenv('METRICS_DIR') or None,
+        flush_interval_seconds=float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+    )
+
+metrics = setup_metrics()
\ No newline at end of file
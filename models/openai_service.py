@@ -1,24 +1,521 @@
 import openai
+import aiohttp
+import asyncio
+import json
 import os
-from typing import List, Dict, Any
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from .metrics import metrics
+
+class CircuitOpenError(Exception):
+    pass
+
+class RateLimitExceeded(Exception):
+    pass
+
+class TokenBucket:
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._reserve(amount, deadline)
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, amount: float = 1.0, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._reserve(amount, deadline)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    def _reserve(self, amount: float, deadline: Optional[float]) -> float:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+            self._updated = now
+
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0
+
+            wait = (amount - self._tokens) / self.refill_per_second
+
+        if deadline is not None and now + wait > deadline:
+            raise RateLimitExceeded(f"Rate limit would delay this call by {wait:.1f}s")
+        return min(wait, 0.25)
+
+class CircuitBreaker:
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold or self._opened_at is not None:
+                self._opened_at = time.monotonic()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return 'half-open'
+        return 'open'
+
+class LLMClient:
+
+    RETRYABLE_ERRORS = (
+        openai.error.RateLimitError,
+        openai.error.ServiceUnavailableError,
+        openai.error.APIConnectionError,
+        openai.error.Timeout
+    )
+
+    def __init__(self, timeout: float = 15.0, max_retries: int = 3, backoff_seconds: float = 0.5,
+                 requests_per_minute: float = 500, tokens_per_minute: float = 30000, pool_size: int = 16,
+                 failure_threshold: int = 5, reset_seconds: float = 30.0, async_pool_size: int = 256):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        self.session = session
+        openai.requestssession = session
+
+        self.async_pool_size = async_pool_size
+        self._aiosession = None
+        self._aiosession_loop = None
+
+    def is_available(self) -> bool:
+        return self.breaker.state != 'open'
+
+    def chat_completion(self, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        deadline = self._start_call(timeout)
+        tokens = self._estimate_tokens(kwargs)
+
+        attempt = 0
+        while True:
+            try:
+                self.request_bucket.acquire(1, timeout=deadline - time.monotonic())
+                self.token_bucket.acquire(tokens, timeout=deadline - time.monotonic())
+            except RateLimitExceeded:
+                self.breaker.release_trial()
+                raise
+
+            try:
+                response = openai.ChatCompletion.create(
+                    request_timeout=max(0.1, deadline - time.monotonic()),
+                    **kwargs
+                )
+                self.breaker.record_success()
+                return response
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline)
+                attempt += 1
+                time.sleep(delay)
+
+    async def achat_completion(self, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        deadline = self._start_call(timeout)
+        tokens = self._estimate_tokens(kwargs)
+
+        openai.aiosession.set(self._get_aiosession())
+
+        attempt = 0
+        while True:
+            try:
+                await self.request_bucket.acquire_async(1, timeout=deadline - time.monotonic())
+                await self.token_bucket.acquire_async(tokens, timeout=deadline - time.monotonic())
+            except RateLimitExceeded:
+                self.breaker.release_trial()
+                raise
+
+            try:
+                response = await openai.ChatCompletion.acreate(
+                    request_timeout=max(0.1, deadline - time.monotonic()),
+                    **kwargs
+                )
+                self.breaker.record_success()
+                return response
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    def _start_call(self, timeout: Optional[float]) -> float:
+        if timeout is not None and timeout <= 0:
+            raise openai.error.Timeout("Deadline exceeded before the OpenAI call started")
+        timeout = min(timeout, self.timeout) if timeout else self.timeout
+        if not self.breaker.allow():
+            raise CircuitOpenError("OpenAI circuit breaker is open")
+        return time.monotonic() + timeout
+
+    def _retry_delay(self, error: Exception, attempt: int, deadline: float) -> float:
+        retryable = isinstance(error, self.RETRYABLE_ERRORS) or (
+            isinstance(error, openai.error.APIError) and (error.http_status or 0) >= 500
+        )
+        delay = self.backoff_seconds * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+        if not retryable or attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+            if retryable:
+                self.breaker.record_failure()
+            else:
+                self.breaker.release_trial()
+            raise error
+
+        print(f"OpenAI call failed ({error}), retrying in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})")
+        return delay
+
+    def _get_aiosession(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._aiosession is None or self._aiosession.closed or self._aiosession_loop is not loop:
+            self._aiosession = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.async_pool_size))
+            self._aiosession_loop = loop
+        return self._aiosession
+
+    async def aclose(self) -> None:
+        session, self._aiosession = self._aiosession, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _estimate_tokens(self, kwargs: Dict[str, Any]) -> float:
+        prompt_chars = sum(len(m.get('content', '')) for m in kwargs.get('messages', []))
+        return prompt_chars / 4 + kwargs.get('max_tokens', 0)
+
+def setup_llm_client() -> LLMClient:
+    return LLMClient(
+        timeout=float(os.getenv('OPENAI_TIMEOUT_SECONDS', 15)),
+        max_retries=int(os.getenv('OPENAI_MAX_RETRIES', 3)),
+        requests_per_minute=float(os.getenv('OPENAI_REQUESTS_PER_MINUTE', 500)),
+        tokens_per_minute=float(os.getenv('OPENAI_TOKENS_PER_MINUTE', 30000)),
+        pool_size=int(os.getenv('OPENAI_POOL_SIZE', 16)),
+        failure_threshold=int(os.getenv('OPENAI_BREAKER_FAILURES', 5)),
+        reset_seconds=float(os.getenv('OPENAI_BREAKER_RESET_SECONDS', 30)),
+        async_pool_size=int(os.getenv('OPENAI_ASYNC_POOL_SIZE', 256))
+    )
 
 class OpenAIService:
 
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, deadline_seconds: Optional[float] = None,
+                 client: Optional[LLMClient] = None):
         openai.api_key = os.getenv('OPENAI_API_KEY')
+        if os.getenv('OPENAI_API_BASE'):
+            openai.api_base = os.getenv('OPENAI_API_BASE')
         if not openai.api_key:
             print("Warning: OPENAI_API_KEY not found in environment variables")
+
+        self.max_workers = max_workers or int(os.getenv('OPENAI_MAX_WORKERS', 8))
+        self.deadline_seconds = deadline_seconds or float(os.getenv('OPENAI_DEADLINE_SECONDS', 20))
+        self.generation_mode = os.getenv('OPENAI_GENERATION_MODE', 'combined').lower()
+        self.client = client or setup_llm_client()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return bool(openai.api_key) and self.client.is_available()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def generate_enhanced_response_and_rationale(self, query: str, products: List[Dict[str, Any]], initial_response: str,
+                                                 initial_rationale: List[str]) -> Tuple[str, List[str]]:
+        if not openai.api_key or not products:
+            return initial_response, initial_rationale
+
+        deadline = time.monotonic() + self.deadline_seconds
+
+        if self.generation_mode == 'combined':
+            try:
+                response = self.client.chat_completion(
+                    **self._combined_request(query, products, initial_response, initial_rationale, deadline)
+                )
+                content, error = response.choices[0].message.content, None
+            except Exception as e:
+                content, error = None, e
+
+            combined = self._combined_or_fallback(content, error, deadline, initial_response, initial_rationale)
+            if combined is not None:
+                return combined
+
+        executor = self._get_executor()
+        response_future = executor.submit(self.generate_enhanced_response, query, products, initial_response)
+        rationale_future = executor.submit(self.generate_enhanced_rationale, query, products, initial_rationale)
+
+        response = self._result_before(response_future, deadline, initial_response, "enhanced response")
+        rationale = self._result_before(rationale_future, deadline, initial_rationale, "enhanced rationale")
+
+        return response, rationale
+
+    def _combined_request(self, query: str, products: List[Dict[str, Any]], initial_response: str,
+                          initial_rationale: List[str], deadline: float) -> Dict[str, Any]:
+        return {
+            "model": "gpt-4o",
+            "messages": self._combined_messages(query, products, initial_response, initial_rationale),
+            "max_tokens": 550,
+            "temperature": 0.7,
+            "response_format": {"type": "json_object"},
+            "timeout": deadline - time.monotonic()
+        }
+
+    def _combined_or_fallback(self, content: Optional[str], error: Optional[Exception], deadline: float,
+                              initial_response: str, initial_rationale: List[str]) -> Optional[Tuple[str, List[str]]]:
+        # None means the combined answer was unusable and there is still time for the two separate calls.
+        if error is not None:
+            metrics.inc('llm_fallbacks_total', call='combined_response', reason='error')
+            print(f"Error generating combined response: {error}")
+            return initial_response, initial_rationale
+
+        combined = self._parse_combined_response(content)
+        if combined is None and deadline <= time.monotonic():
+            return initial_response, initial_rationale
+        return combined
+
+    async def agenerate_enhanced_response_and_rationale(self, query: str, products: List[Dict[str, Any]], initial_response: str,
+                                                        initial_rationale: List[str]) -> Tuple[str, List[str]]:
+        if not openai.api_key or not products:
+            return initial_response, initial_rationale
+
+        deadline = time.monotonic() + self.deadline_seconds
+
+        if self.generation_mode == 'combined':
+            try:
+                response = await self.client.achat_completion(
+                    **self._combined_request(query, products, initial_response, initial_rationale, deadline)
+                )
+                content, error = response.choices[0].message.content, None
+            except Exception as e:
+                content, error = None, e
+
+            combined = self._combined_or_fallback(content, error, deadline, initial_response, initial_rationale)
+            if combined is not None:
+                return combined
+
+        response, rationale = await asyncio.gather(
+            self._acomplete(
+                self._enhanced_response_messages(query, products, initial_response),
+                300, deadline, initial_response, lambda content: content.strip(), "enhanced response"
+            ),
+            self._acomplete(
+                self._rationale_messages(query, products, initial_rationale),
+                250, deadline, initial_rationale, self._parse_rationale, "enhanced rationale"
+            )
+        )
+        return response, rationale
+
+    async def agenerate_followup_response(self, original_query: str, followup_query: str, products: List[Dict[str, Any]],
+                                          history: Optional[List[Dict[str, str]]] = None) -> str:
+        if not openai.api_key:
+            return self._followup_unavailable_response(original_query, followup_query)
+
+        return await self._acomplete(
+            self._followup_messages(original_query, followup_query, products, history),
+            300, time.monotonic() + self.deadline_seconds,
+            self._followup_error_response(original_query, followup_query),
+            lambda content: content.strip(), "follow-up response"
+        )
+
+    async def _acomplete(self, messages: List[Dict[str, str]], max_tokens: int, deadline: float, fallback: Any,
+                         parse, label: str, **kwargs: Any) -> Any:
+        try:
+            response = await self.client.achat_completion(
+                model="gpt-4o",
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.7,
+                timeout=deadline - time.monotonic(),
+                **kwargs
+            )
+            parsed = parse(response.choices[0].message.content)
+            return parsed if parsed else fallback
+        except Exception as e:
+            metrics.inc('llm_fallbacks_total', call=label.replace(' ', '_'), reason='error')
+            print(f"Error generating {label}: {e}")
+            return fallback
+
+    def _combined_messages(self, query: str, products: List[Dict[str, Any]], initial_response: str,
+                           initial_rationale: List[str]) -> List[Dict[str, str]]:
+        product_text = self._format_products(products)
+
+        rationale_text = "\n".join([f"- {r}" for r in initial_rationale])
+
+        prompt = f"""
+            User Query: "{query}"
+            
+            Available Products:
+            {product_text}
+            
+            Initial Response: "{initial_response}"
+            
+            Initial Rationale:
+            {rationale_text}
+            
+            Return a JSON object with exactly two keys:
+            "response": an improved, detailed answer that directly addresses the user's query, highlights key features of the top products, explains why they match the user's needs and uses a friendly, helpful tone.
+            "rationale": an array of 4-6 short strings explaining specifically why these products match the query, highlighting common features and comparing them to alternatives.
+            """
+
+        return [
+            {"role": "system", "content": "You are a helpful product recommendation assistant. Always reply with a single JSON object."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _parse_combined_response(self, content: str) -> Optional[Tuple[str, List[str]]]:
+        try:
+            data = json.loads(content)
+        except (TypeError, ValueError):
+            print("Combined response was not valid JSON")
+            return None
+
+        if not isinstance(data, dict):
+            return None
+
+        response = data.get('response')
+        rationale = data.get('rationale')
+        if not isinstance(response, str) or not response.strip():
+            print("Combined response is missing a 'response' string")
+            return None
+        if not isinstance(rationale, list) or not rationale or not all(isinstance(r, str) and r.strip() for r in rationale):
+            print("Combined response is missing a 'rationale' list of strings")
+            return None
+
+        return response.strip(), [r.strip().lstrip('-').strip() for r in rationale]
+
+    def _format_products(self, products: List[Dict[str, Any]]) -> str:
+        return "\n".join([
+            f"- {p['name']}: {p['description']} (Price: ${p['price']})" for p in products[:3]
+        ])
+
+    def _result_before(self, future, deadline: float, fallback: Any, label: str) -> Any:
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            metrics.inc('llm_fallbacks_total', call=label.replace(' ', '_'), reason='timeout')
+            print(f"Timed out waiting for {label} after {self.deadline_seconds}s")
+        except Exception as e:
+            metrics.inc('llm_fallbacks_total', call=label.replace(' ', '_'), reason='error')
+            print(f"Error generating {label}: {e}")
+        return fallback
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='openai')
+            return self._executor
         
     def generate_enhanced_response(self, query: str, products: List[Dict[str, Any]], initial_response: str) -> str:
         if not openai.api_key or not products:
             return initial_response
             
         try:
-            product_text = "\n".join([
-                f"- {p['name']}: {p['description']} (Price: ${p['price']})" for p in products[:3]
-            ])
+            response = self.client.chat_completion(
+                model="gpt-4o",  
+                messages=self._enhanced_response_messages(query, products, initial_response),
+                max_tokens=300,
+                temperature=0.7
+            )
             
-            prompt = f"""
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            metrics.inc('llm_fallbacks_total', call='enhanced_response', reason='error')
+            print(f"Error generating enhanced response: {e}")
+            return initial_response
+
+    def stream_enhanced_answer(self, query: str, products: List[Dict[str, Any]], initial_response: str,
+                               initial_rationale: List[str]) -> Iterator[Tuple[str, Any]]:
+        if not openai.api_key or not products:
+            yield 'rationale', initial_rationale
+            return
+
+        deadline = time.monotonic() + self.deadline_seconds
+        rationale_future = self._get_executor().submit(self.generate_enhanced_rationale, query, products, initial_rationale)
+
+        streamed = False
+        try:
+            chunks = self.client.chat_completion(
+                model="gpt-4o",  
+                messages=self._enhanced_response_messages(query, products, initial_response),
+                max_tokens=300,
+                temperature=0.7,
+                stream=True,
+                timeout=self.deadline_seconds
+            )
+
+            for chunk in chunks:
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.get('content')
+                if token:
+                    streamed = True
+                    yield 'token', token
+                if time.monotonic() > deadline:
+                    print(f"Enhanced response stream exceeded {self.deadline_seconds}s, truncating")
+                    break
+        except Exception as e:
+            metrics.inc('llm_fallbacks_total', call='enhanced_response_stream', reason='error')
+            print(f"Error streaming enhanced response: {e}")
+
+        if not streamed:
+            yield 'token', initial_response
+
+        yield 'rationale', self._result_before(rationale_future, deadline, initial_rationale, "enhanced rationale")
+
+    def _enhanced_response_messages(self, query: str, products: List[Dict[str, Any]], initial_response: str) -> List[Dict[str, str]]:
+        product_text = self._format_products(products)
+        
+        prompt = f"""
             User Query: "{query}"
             
             Available Products:
@@ -34,34 +531,38 @@ class OpenAIService:
             
             Response:
             """
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",  
-                messages=[
-                    {"role": "system", "content": "You are a helpful product recommendation assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"Error generating enhanced response: {e}")
-            return initial_response
+
+        return [
+            {"role": "system", "content": "You are a helpful product recommendation assistant."},
+            {"role": "user", "content": prompt}
+        ]
             
     def generate_enhanced_rationale(self, query: str, products: List[Dict[str, Any]], initial_rationale: List[str]) -> List[str]:
         if not openai.api_key or not products:
             return initial_rationale
             
         try:
-            product_text = "\n".join([
-                f"- {p['name']}: {p['description']} (Price: ${p['price']})" for p in products[:3]
-            ])
+            response = self.client.chat_completion(
+                model="gpt-4o",  
+                messages=self._rationale_messages(query, products, initial_rationale),
+                max_tokens=250,
+                temperature=0.7
+            )
             
-            rationale_text = "\n".join([f"- {r}" for r in initial_rationale])
+            rationale = self._parse_rationale(response.choices[0].message.content)
             
-            prompt = f"""
+            return rationale if rationale else initial_rationale
+        except Exception as e:
+            metrics.inc('llm_fallbacks_total', call='enhanced_rationale', reason='error')
+            print(f"Error generating enhanced rationale: {e}")
+            return initial_rationale
+            
+    def _rationale_messages(self, query: str, products: List[Dict[str, Any]], initial_rationale: List[str]) -> List[Dict[str, str]]:
+        product_text = self._format_products(products)
+        
+        rationale_text = "\n".join([f"- {r}" for r in initial_rationale])
+        
+        prompt = f"""
             User Query: "{query}"
             
             Top Products:
@@ -78,42 +579,47 @@ class OpenAIService:
             
             Return just the bullet points without any introductory text. Each point should start with a '-'.
             """
+
+        return [
+            {"role": "system", "content": "You are a helpful product recommendation assistant."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _parse_rationale(self, content: str) -> List[str]:
+        content = content.strip()
+        return [line.strip()[2:].strip() for line in content.split('\n') if line.strip().startswith('-')]
+            
+    def generate_followup_response(self, original_query: str, followup_query: str, products: List[Dict[str, Any]],
+                                   history: Optional[List[Dict[str, str]]] = None) -> str:
+        if not openai.api_key:
+            return self._followup_unavailable_response(original_query, followup_query)
             
-            response = openai.ChatCompletion.create(
+        try:
+            response = self.client.chat_completion(
                 model="gpt-4o",  
-                messages=[
-                    {"role": "system", "content": "You are a helpful product recommendation assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=250,
+                messages=self._followup_messages(original_query, followup_query, products, history),
+                max_tokens=300,
                 temperature=0.7
             )
             
-            content = response.choices[0].message.content.strip()
-            rationale = [line.strip()[2:].strip() for line in content.split('\n') if line.strip().startswith('-')]
-            
-            return rationale if rationale else initial_rationale
+            return response.choices[0].message.content.strip()
         except Exception as e:
-            print(f"Error generating enhanced rationale: {e}")
-            return initial_rationale
-            
-    def generate_followup_response(self, original_query: str, followup_query: str, products: List[Dict[str, Any]]) -> str:
-        if not openai.api_key:
-            return f"Regarding your follow-up question about \"{followup_query}\", I've analyzed the products from your initial query about \"{original_query}\". However, I don't have enough information to provide a specific answer. Please try asking a more specific question."
-            
-        try:
-            product_text = "\n".join([
-                f"- {p['name']}: {p['description']} (Price: ${p['price']})" for p in products[:3]
-            ])
-            
-            specs_text = ""
-            for product in products[:3]:
-                if 'specs' in product and product['specs']:
-                    specs_text += f"\nSpecs for {product['name']}:\n"
-                    for key, value in product['specs'].items():
-                        specs_text += f"- {key}: {value}\n"
-            
-            prompt = f"""
+            metrics.inc('llm_fallbacks_total', call='follow-up_response', reason='error')
+            print(f"Error generating follow-up response: {e}")
+            return self._followup_error_response(original_query, followup_query)
+
+    def _followup_messages(self, original_query: str, followup_query: str, products: List[Dict[str, Any]],
+                           history: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        product_text = self._format_products(products)
+        
+        specs_text = ""
+        for product in products[:3]:
+            if 'specs' in product and product['specs']:
+                specs_text += f"\nSpecs for {product['name']}:\n"
+                for key, value in product['specs'].items():
+                    specs_text += f"- {key}: {value}\n"
+        
+        prompt = f"""
             Original Query: "{original_query}"
             Follow-up Query: "{followup_query}"
             
@@ -131,18 +637,16 @@ class OpenAIService:
             
             Your response should be conversational but informative, focusing on addressing the user's specific follow-up question.
             """
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",  
-                messages=[
-                    {"role": "system", "content": "You are a helpful product recommendation assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"Error generating follow-up response: {e}")
-            return f"Regarding your follow-up question about \"{followup_query}\", I've analyzed the products from your initial query about \"{original_query}\". However, I encountered a technical issue. The Acer Nitro 5 has the best battery life among the recommended laptops, with up to 8 hours of usage on a single charge."
\ No newline at end of file
+
+        messages = [{"role": "system", "content": "You are a helpful product recommendation assistant."}]
+        for turn in history or []:
+            messages.append({"role": "user", "content": turn['query']})
+            messages.append({"role": "assistant", "content": turn['response']})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _followup_unavailable_response(self, original_query: str, followup_query: str) -> str:
+        return f"Regarding your follow-up question about \"{followup_query}\", I've analyzed the products from your initial query about \"{original_query}\". However, I don't have enough information to provide a specific answer. Please try asking a more specific question."
+
+    def _followup_error_response(self, original_query: str, followup_query: str) -> str:
+        return f"Regarding your follow-up question about \"{followup_query}\", I've analyzed the products from your initial query about \"{original_query}\". However, I encountered a technical issue. Please try again in a moment."
\ No newline at end of file
@@ -0,0 +1,61 @@
+from typing import Any, Dict, Optional
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+import tempfile
+import numpy as np
+from .catalog_loader import LoadProgress
+from .embeddings import EmbeddingProvider
+from .product_catalog import ProductCatalog
+from .product_store import ProductStore
+from .vector_db import VectorDb, create_product_text
+
+_worker = {}
+
+def build_vectors_parallel(vector_db: VectorDb, catalog: ProductCatalog, workers: Optional[int] = None,
+                           batch_size: int = 1024, build_dir: Optional[str] = None) -> Dict[str, Any]:
+    workers = workers or os.cpu_count() or 1
+    rows = catalog.store.live_rows()
+    size = rows.shape[0]
+
+    fd, path = tempfile.mkstemp(prefix='.vectors-', suffix='.npy', dir=build_dir)
+    os.close(fd)
+    try:
+        matrix = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(size, vector_db.dimensions))
+        del matrix
+
+        progress = LoadProgress(f"Embedding catalog with {workers} workers", total=size)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(vector_db.embedding_provider, catalog.store, path)) as executor:
+            pending = set()
+            for start in range(0, size, batch_size):
+                pending.add(executor.submit(_embed_rows, start, rows[start:start + batch_size]))
+
+                if len(pending) >= workers * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        progress.update(future.result())
+
+            for future in pending:
+                progress.update(future.result())
+        stats = progress.finish()
+
+        vector_db.set_vectors(catalog.store.ids[rows].copy(), np.load(path, mmap_mode='r'))
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    return {**stats, "workers": workers}
+
+def _init_worker(embedding_provider: EmbeddingProvider, store: ProductStore, path: str) -> None:
+    _worker['provider'] = embedding_provider
+    _worker['store'] = store
+    _worker['matrix'] = np.load(path, mmap_mode='r+')
+
+def _embed_rows(start: int, rows: np.ndarray) -> int:
+    texts = [create_product_text(product) for product in _worker['store'].views(rows)]
+    vectors = np.asarray(_worker['provider'].embed(texts), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    _worker['matrix'][start:start + len(texts)] = vectors / np.where(norms > 0, norms, 1)
+    return len(texts)
\ No newline at end of file
@@ -1,6 +1,16 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Mapping, Optional
+import hashlib
+import json
+import os
+import numpy as np
+from .product_store import ProductStore, ProductView
+
+def load_product_catalog(path: Optional[str] = None) -> Iterable[Dict[str, Any]]:
+    path = path or os.getenv('PRODUCT_CATALOG_PATH')
+    if path:
+        from .catalog_loader import iter_products
+        return iter_products(path)
 
-def load_product_catalog() -> List[Dict[str, Any]]:
     return [
         {
             "id": 1,
@@ -102,4 +112,71 @@ def load_product_catalog() -> List[Dict[str, Any]]:
             },
             "recommendation": "The Lenovo Legion 5 with its AMD Ryzen 5 processor offers excellent multi-core performance for video editing tasks. AMD processors often perform very well in multi-threaded applications like video rendering. The RTX 3050 Ti GPU and 16GB of RAM make this a strong contender for video editing under $1000. It also features an advanced cooling system that helps maintain performance during long rendering sessions, which is particularly valuable for video editing workloads."
         }
-    ]
\ No newline at end of file
+    ]
+
+def catalog_hash(products: Iterable[Mapping]) -> str:
+    if isinstance(products, ProductCatalog):
+        return products.store.content_hash()
+
+    digest = hashlib.sha256()
+    for product in products:
+        digest.update(json.dumps(dict(product), sort_keys=True).encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+class ProductCatalog:
+
+    def __init__(self, products: Iterable[Mapping] = ()):
+        self.store = ProductStore()
+        self.store.extend(products)
+
+    @property
+    def products(self) -> List[ProductView]:
+        return self.store.views()
+
+    def get(self, product_id: int) -> Optional[ProductView]:
+        return self.store.view(product_id)
+
+    def get_many(self, product_ids: List[int]) -> List[ProductView]:
+        views = (self.store.view(product_id) for product_id in product_ids)
+        return [view for view in views if view is not None]
+
+    def by_category(self, category: str) -> List[ProductView]:
+        category = category.lower()
+        codes = [code for code, value in enumerate(self.store.category_table.values) if value.lower() == category]
+        return self.store.views(self.store.category_rows(codes))
+
+    def in_price_range(self, min_price: Optional[float] = None, max_price: Optional[float] = None) -> List[ProductView]:
+        return self.store.views(self.store.price_range_rows(min_price, max_price))
+
+    def upsert(self, product: Mapping) -> None:
+        self.store.upsert(product)
+
+    def extend(self, products: Iterable[Mapping]) -> None:
+        self.store.extend(products)
+
+    def remove(self, product_id: int) -> Optional[Dict[str, Any]]:
+        product = self.store.view(product_id)
+        if product is None:
+            return None
+        product = product.to_dict()
+        self.store.remove(product_id)
+        return product
+
+    def categories(self) -> List[str]:
+        codes = np.unique(self.store.categories[self.store.live_rows()])
+        return sorted({self.store.category_table.values[code] for code in codes.tolist()})
+
+    def iter_batches(self, batch_size: int) -> Iterator[List[ProductView]]:
+        rows = self.store.live_rows()
+        for start in range(0, rows.shape[0], batch_size):
+            yield self.store.views(rows[start:start + batch_size])
+
+    def __iter__(self) -> Iterator[ProductView]:
+        return iter(self.store.views())
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __contains__(self, product_id: int) -> bool:
+        return self.store.row_of(product_id) is not None
\ No newline at end of file
@@ -0,0 +1,149 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+import numpy as np
+from .product_store import ProductStore
+
+class ProductFilter:
+
+    def __init__(self, category: Optional[str] = None, min_price: Optional[float] = None,
+                 max_price: Optional[float] = None, min_rating: Optional[float] = None,
+                 specs: Optional[List[str]] = None):
+        self.category = category.lower() if category else None
+        self.min_price = min_price
+        self.max_price = max_price
+        self.min_rating = min_rating
+        self.specs = sorted({key.lower() for key in specs or [] if key})
+
+    @classmethod
+    def from_args(cls, args: Mapping[str, Any]) -> Optional['ProductFilter']:
+        if not isinstance(args, Mapping):
+            raise ValueError("Invalid filters: expected an object")
+
+        specs = args.get('spec') or []
+        if isinstance(specs, str):
+            specs = [specs]
+        if not isinstance(specs, list) or not all(isinstance(value, str) for value in specs):
+            raise ValueError(f"Invalid spec: {specs}")
+        specs = [key for value in specs for key in value.split(',')]
+
+        category = args.get('category') or None
+        if category is not None and not isinstance(category, str):
+            raise ValueError(f"Invalid category: {category}")
+
+        product_filter = cls(
+            category=category,
+            min_price=_parse_number(args, 'minPrice'),
+            max_price=_parse_number(args, 'maxPrice'),
+            min_rating=_parse_number(args, 'minRating'),
+            specs=[key.strip() for key in specs]
+        )
+        return None if product_filter.is_empty() else product_filter
+
+    def is_empty(self) -> bool:
+        return (self.category is None and self.min_price is None and self.max_price is None
+                and self.min_rating is None and not self.specs)
+
+    def matches(self, product: Dict[str, Any]) -> bool:
+        if self.category is not None and product.get('category', '').lower() != self.category:
+            return False
+        price = product.get('price', 0)
+        if self.min_price is not None and price < self.min_price:
+            return False
+        if self.max_price is not None and price > self.max_price:
+            return False
+        if self.min_rating is not None and product.get('rating', 0) < self.min_rating:
+            return False
+        keys = {key.lower() for key in product.get('specs', {})}
+        return all(key in keys for key in self.specs)
+
+    def cache_key(self) -> str:
+        return f"{self.category}|{self.min_price}|{self.max_price}|{self.min_rating}|{','.join(self.specs)}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "category": self.category,
+            "minPrice": self.min_price,
+            "maxPrice": self.max_price,
+            "minRating": self.min_rating,
+            "specs": self.specs
+        }
+
+class FilterIndex:
+
+    def __init__(self, row_ids: np.ndarray, store: ProductStore):
+        self.size = len(row_ids)
+        self.store = store
+
+        self._ids = np.array(row_ids, dtype=np.int64)
+        self._present = np.zeros(self.size, dtype=bool)
+        self.prices = np.full(self.size, np.nan)
+        self.ratings = np.full(self.size, np.nan)
+        self.categories = np.full(self.size, -1, dtype=np.int32)
+        self._spec_masks = {}
+        self._refresh(np.arange(self.size))
+
+    def updated(self, row_ids: np.ndarray, product_ids: Iterable[int]) -> 'FilterIndex':
+        if len(row_ids) < self.size:
+            return FilterIndex(row_ids, self.store)
+
+        index = FilterIndex.__new__(FilterIndex)
+        index.size = len(row_ids)
+        index.store = self.store
+        index._ids = np.array(row_ids, dtype=np.int64)
+        index._present = _extend(self._present, index.size, False)
+        index.prices = _extend(self.prices, index.size, np.nan)
+        index.ratings = _extend(self.ratings, index.size, np.nan)
+        index.categories = _extend(self.categories, index.size, -1)
+        index._spec_masks = {key: _extend(mask, index.size, False) for key, mask in list(self._spec_masks.items())}
+
+        changed = np.flatnonzero(np.isin(index._ids[:self.size], np.fromiter(product_ids, dtype=np.int64)))
+        index._refresh(np.concatenate([changed, np.arange(self.size, index.size)]))
+        return index
+
+    def rows(self, product_filter: ProductFilter) -> np.ndarray:
+        mask = self._present.copy()
+
+        if product_filter.category is not None:
+            codes = [
+                code for code, value in enumerate(self.store.category_table.values)
+                if value.lower() == product_filter.category
+            ]
+            mask &= np.isin(self.categories, codes)
+        if product_filter.min_price is not None:
+            mask &= self.prices >= product_filter.min_price
+        if product_filter.max_price is not None:
+            mask &= self.prices <= product_filter.max_price
+        if product_filter.min_rating is not None:
+            mask &= self.ratings >= product_filter.min_rating
+        for key in product_filter.specs:
+            spec_mask = self._spec_masks.get(key)
+            if spec_mask is None:
+                spec_mask = self._spec_masks[key] = self.store.spec_key_mask(key, self.store.rows_for_ids(self._ids))
+            mask &= spec_mask
+
+        return np.flatnonzero(mask)
+
+    def _refresh(self, rows: np.ndarray) -> None:
+        store_rows = self.store.rows_for_ids(self._ids[rows])
+        present = store_rows >= 0
+        store_rows = np.where(present, store_rows, 0)
+
+        self._present[rows] = present
+        self.prices[rows] = np.where(present, self.store.prices[store_rows], np.nan)
+        self.ratings[rows] = np.where(present, self.store.ratings[store_rows], np.nan)
+        self.categories[rows] = np.where(present, self.store.categories[store_rows], -1)
+        for key, mask in self._spec_masks.items():
+            mask[rows] = self.store.spec_key_mask(key, np.where(present, store_rows, -1))
+
+def _extend(array: np.ndarray, size: int, fill: Any) -> np.ndarray:
+    extended = np.full(size, fill, dtype=array.dtype)
+    extended[:array.shape[0]] = array
+    return extended
+
+def _parse_number(args: Mapping[str, Any], name: str) -> Optional[float]:
+    value = args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {name}: {value}")
\ No newline at end of file
@@ -0,0 +1,376 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from collections.abc import Mapping
+import hashlib
+import numpy as np
+from .spec_attributes import SPEC_ATTRIBUTES, parse_spec_attributes
+
+PRODUCT_FIELDS = ('id', 'name', 'description', 'price', 'originalPrice', 'imageUrl', 'rating',
+                  'reviewCount', 'category', 'specs', 'recommendation')
+
+TEXT_FIELDS = ('name', 'description', 'imageUrl', 'recommendation')
+
+NUMERIC_FIELDS = {'price': 'prices', 'originalPrice': 'original_prices', 'rating': 'ratings', 'reviewCount': 'review_counts'}
+
+class StringTable:
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def intern(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> Optional[int]:
+        return self._codes.get(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+class PackedStrings:
+
+    def __init__(self, capacity: int):
+        self.data = bytearray()
+        self.starts = np.zeros(capacity, dtype=np.int64)
+        self.lengths = np.full(capacity, -1, dtype=np.int32)
+
+    def set(self, row: int, value: Optional[str]) -> None:
+        if value is None:
+            self.lengths[row] = -1
+            return
+        encoded = str(value).encode('utf-8')
+        self.starts[row] = len(self.data)
+        self.lengths[row] = len(encoded)
+        self.data += encoded
+
+    def get(self, row: int) -> Optional[str]:
+        length = self.lengths[row]
+        if length < 0:
+            return None
+        start = self.starts[row]
+        return self.data[start:start + length].decode('utf-8')
+
+    def grow(self, capacity: int) -> None:
+        self.starts = _resize(self.starts, capacity, 0)
+        self.lengths = _resize(self.lengths, capacity, -1)
+
+    def compact(self, rows: np.ndarray) -> None:
+        data = bytearray()
+        starts = np.zeros(max(rows.shape[0], 1), dtype=np.int64)
+        lengths = np.full(max(rows.shape[0], 1), -1, dtype=np.int32)
+        for new_row, row in enumerate(rows):
+            length = self.lengths[row]
+            if length >= 0:
+                starts[new_row] = len(data)
+                lengths[new_row] = length
+                data += self.data[self.starts[row]:self.starts[row] + length]
+        self.data, self.starts, self.lengths = data, starts, lengths
+
+class ProductView(Mapping):
+    __slots__ = ('_store', '_row', '_id')
+
+    def __init__(self, store: 'ProductStore', row: int):
+        self._store = store
+        self._row = row
+        self._id = int(store.ids[row])
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'id':
+            return self._id
+        return self._store.field(self._resolve_row(), key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PRODUCT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(PRODUCT_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"ProductView({self.to_dict()!r})"
+
+    def copy(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def to_dict(self) -> Dict[str, Any]:
+        row = self._resolve_row()
+        return {key: self._id if key == 'id' else self._store.field(row, key) for key in PRODUCT_FIELDS}
+
+    def _resolve_row(self) -> int:
+        if self._row < self._store.size and self._store.ids[self._row] == self._id and self._store.alive[self._row]:
+            return self._row
+        row = self._store.row_of(self._id)
+        if row is None:
+            raise KeyError(f"Product {self._id} is no longer in the catalog")
+        self._row = row
+        return row
+
+class ProductStore:
+
+    def __init__(self, initial_capacity: int = 64):
+        capacity = max(1, initial_capacity)
+        self.size = 0
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.original_prices = np.full(capacity, np.nan, dtype=np.float64)
+        self.ratings = np.zeros(capacity, dtype=np.float64)
+        self.review_counts = np.zeros(capacity, dtype=np.int64)
+        self.categories = np.zeros(capacity, dtype=np.int32)
+        self.spec_starts = np.zeros(capacity, dtype=np.int64)
+        self.spec_counts = np.zeros(capacity, dtype=np.int32)
+
+        self.category_table = StringTable()
+        self.spec_key_table = StringTable()
+        self.spec_value_table = StringTable()
+        self.spec_keys = np.zeros(capacity, dtype=np.int32)
+        self.spec_values = np.zeros(capacity, dtype=np.int32)
+        self.spec_entries = 0
+
+        self.text = {field: PackedStrings(capacity) for field in TEXT_FIELDS}
+        self.attributes = {name: np.full(capacity, np.nan, dtype=np.float32) for name in SPEC_ATTRIBUTES}
+        self._row_by_id = {}
+        self._category_rows = {}
+        self._price_order = None
+        self._dead = 0
+        self._stale = 0
+
+    def upsert(self, product: Mapping) -> int:
+        product_id = int(product['id'])
+        row = self._row_by_id.get(product_id)
+        if row is None:
+            if self.size == self.ids.shape[0]:
+                self._grow(self.size * 2)
+            row = self.size
+            self.size += 1
+            self.ids[row] = product_id
+            self.alive[row] = True
+            self._row_by_id[product_id] = row
+        else:
+            self._stale += 1
+            self._category_rows[int(self.categories[row])].discard(row)
+
+        self.prices[row] = product.get('price') or 0.0
+        original_price = product.get('originalPrice')
+        self.original_prices[row] = np.nan if original_price is None else original_price
+        self.ratings[row] = product.get('rating') or 0.0
+        self.review_counts[row] = product.get('reviewCount') or 0
+        self.categories[row] = self.category_table.intern(product.get('category', ''))
+        self._category_rows.setdefault(int(self.categories[row]), set()).add(row)
+        self._price_order = None
+        for field in TEXT_FIELDS:
+            self.text[field].set(row, product.get(field, '' if field != 'imageUrl' else None))
+        self._set_specs(row, product.get('specs') or {})
+
+        attributes = parse_spec_attributes(product.get('specs') or {})
+        for name, column in self.attributes.items():
+            column[row] = attributes.get(name, np.nan)
+
+        if self._stale > max(self.size, 1024):
+            self.compact()
+            row = self._row_by_id[product_id]
+        return row
+
+    def extend(self, products: Iterable[Mapping]) -> None:
+        for product in products:
+            self.upsert(product)
+
+    def remove(self, product_id: int) -> bool:
+        row = self._row_by_id.pop(product_id, None)
+        if row is None:
+            return False
+        self.alive[row] = False
+        self._category_rows[int(self.categories[row])].discard(row)
+        self._price_order = None
+        self._dead += 1
+        if self._dead > self.size // 2:
+            self.compact()
+        return True
+
+    def row_of(self, product_id: int) -> Optional[int]:
+        return self._row_by_id.get(product_id)
+
+    def rows_for_ids(self, product_ids: np.ndarray) -> np.ndarray:
+        get = self._row_by_id.get
+        return np.fromiter((get(product_id, -1) for product_id in product_ids.tolist()),
+                           dtype=np.int64, count=len(product_ids))
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.alive[:self.size])
+
+    def category_rows(self, codes: Iterable[int]) -> np.ndarray:
+        rows = set()
+        for code in codes:
+            rows.update(self._category_rows.get(code, ()))
+        return np.array(sorted(rows), dtype=np.int64)
+
+    def price_range_rows(self, min_price: Optional[float] = None, max_price: Optional[float] = None) -> np.ndarray:
+        order = self._price_order
+        if order is None:
+            rows = self.live_rows()
+            order = self._price_order = rows[np.argsort(self.prices[rows], kind='stable')]
+
+        prices = self.prices[order]
+        start = 0 if min_price is None else np.searchsorted(prices, min_price, side='left')
+        end = order.shape[0] if max_price is None else np.searchsorted(prices, max_price, side='right')
+        return order[start:end]
+
+    def content_hash(self, fields: Iterable[str] = PRODUCT_FIELDS) -> str:
+        rows = self.live_rows()
+        digest = hashlib.sha256()
+        digest.update(self.ids[rows].tobytes())
+        for field in fields:
+            digest.update(field.encode('utf-8'))
+            if field in TEXT_FIELDS:
+                self._hash_text(digest, self.text[field], rows)
+            elif field in NUMERIC_FIELDS:
+                digest.update(getattr(self, NUMERIC_FIELDS[field])[rows].tobytes())
+            elif field == 'category':
+                digest.update(self.categories[rows].tobytes())
+                digest.update('\0'.join(self.category_table.values).encode('utf-8'))
+            elif field == 'specs':
+                digest.update(self.spec_counts[rows].tobytes())
+                entries = self._spec_entries(rows)
+                digest.update(self.spec_keys[entries].tobytes())
+                digest.update(self.spec_values[entries].tobytes())
+                for table in (self.spec_key_table, self.spec_value_table):
+                    digest.update('\0'.join(table.values).encode('utf-8'))
+        return digest.hexdigest()
+
+    def view(self, product_id: int) -> Optional[ProductView]:
+        row = self._row_by_id.get(product_id)
+        return None if row is None else ProductView(self, row)
+
+    def views(self, rows: Optional[np.ndarray] = None) -> List[ProductView]:
+        rows = self.live_rows() if rows is None else rows
+        return [ProductView(self, row) for row in rows.tolist()]
+
+    def field(self, row: int, key: str) -> Any:
+        if key in TEXT_FIELDS:
+            return self.text[key].get(row)
+        if key == 'price':
+            return float(self.prices[row])
+        if key == 'originalPrice':
+            value = self.original_prices[row]
+            return None if np.isnan(value) else float(value)
+        if key == 'rating':
+            return float(self.ratings[row])
+        if key == 'reviewCount':
+            return int(self.review_counts[row])
+        if key == 'category':
+            return self.category_table.values[self.categories[row]]
+        if key == 'specs':
+            start = self.spec_starts[row]
+            end = start + self.spec_counts[row]
+            return {
+                self.spec_key_table.values[key_code]: self.spec_value_table.values[value_code]
+                for key_code, value_code in zip(self.spec_keys[start:end].tolist(), self.spec_values[start:end].tolist())
+            }
+        if key == 'id':
+            return int(self.ids[row])
+        raise KeyError(key)
+
+    def spec_key_mask(self, key: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        rows = self.live_rows() if rows is None else rows
+        mask = np.zeros(rows.shape[0], dtype=bool)
+        key = key.lower()
+        codes = [code for code, value in enumerate(self.spec_key_table.values) if value.lower() == key]
+        if not codes:
+            return mask
+
+        present = np.flatnonzero(rows >= 0)
+        entries = self._spec_entries(rows[present])
+        entry_positions = np.repeat(present, self.spec_counts[rows[present]])
+        mask[entry_positions[np.isin(self.spec_keys[entries], codes)]] = True
+        return mask
+
+    def compact(self) -> None:
+        rows = self.live_rows()
+        capacity = max(1, rows.shape[0])
+
+        for name in ('ids', 'prices', 'original_prices', 'ratings', 'review_counts', 'categories'):
+            setattr(self, name, _resize(getattr(self, name)[rows], capacity, 0))
+        self.alive = np.ones(capacity, dtype=bool)
+        self.alive[rows.shape[0]:] = False
+        for column in self.text.values():
+            column.compact(rows)
+        for name, column in self.attributes.items():
+            self.attributes[name] = _resize(column[rows], capacity, np.nan)
+
+        counts = self.spec_counts[rows]
+        entries = self._spec_entries(rows)
+        self.spec_keys = _resize(self.spec_keys[entries], max(1, entries.shape[0]), 0)
+        self.spec_values = _resize(self.spec_values[entries], max(1, entries.shape[0]), 0)
+        self.spec_entries = entries.shape[0]
+        self.spec_counts = _resize(counts, capacity, 0)
+        self.spec_starts = _resize(np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64), capacity, 0)
+
+        self.size = rows.shape[0]
+        self._dead = 0
+        self._stale = 0
+        self._row_by_id = dict(zip(self.ids[:self.size].tolist(), range(self.size)))
+        categories = self.categories[:self.size]
+        self._category_rows = {
+            int(code): set(np.flatnonzero(categories == code).tolist()) for code in np.unique(categories)
+        }
+        self._price_order = None
+
+    def memory_bytes(self) -> int:
+        arrays = (self.ids, self.alive, self.prices, self.original_prices, self.ratings, self.review_counts,
+                  self.categories, self.spec_starts, self.spec_counts, self.spec_keys, self.spec_values)
+        total = sum(array.nbytes for array in arrays) + sum(column.nbytes for column in self.attributes.values())
+        for column in self.text.values():
+            total += len(column.data) + column.starts.nbytes + column.lengths.nbytes
+        return total
+
+    def __len__(self) -> int:
+        return len(self._row_by_id)
+
+    def _spec_entries(self, rows: np.ndarray) -> np.ndarray:
+        counts = self.spec_counts[rows]
+        offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(self.spec_starts[rows], counts) + offsets
+
+    def _hash_text(self, digest: Any, column: PackedStrings, rows: np.ndarray) -> None:
+        lengths = column.lengths[rows]
+        digest.update(lengths.tobytes())
+        if self._dead == 0 and self._stale == 0:
+            digest.update(column.data)
+            return
+
+        data = memoryview(column.data)
+        for start, length in zip(column.starts[rows].tolist(), lengths.tolist()):
+            if length > 0:
+                digest.update(data[start:start + length])
+
+    def _set_specs(self, row: int, specs: Mapping) -> None:
+        count = len(specs)
+        while self.spec_entries + count > self.spec_keys.shape[0]:
+            capacity = self.spec_keys.shape[0] * 2
+            self.spec_keys = _resize(self.spec_keys, capacity, 0)
+            self.spec_values = _resize(self.spec_values, capacity, 0)
+
+        start = self.spec_entries
+        for offset, (key, value) in enumerate(specs.items()):
+            self.spec_keys[start + offset] = self.spec_key_table.intern(str(key))
+            self.spec_values[start + offset] = self.spec_value_table.intern(str(value))
+        self.spec_starts[row] = start
+        self.spec_counts[row] = count
+        self.spec_entries += count
+
+    def _grow(self, capacity: int) -> None:
+        for name in ('ids', 'alive', 'prices', 'ratings', 'review_counts', 'categories', 'spec_starts', 'spec_counts'):
+            setattr(self, name, _resize(getattr(self, name), capacity, 0))
+        self.original_prices = _resize(self.original_prices, capacity, np.nan)
+        for column in self.text.values():
+            column.grow(capacity)
+        for name, column in self.attributes.items():
+            self.attributes[name] = _resize(column, capacity, np.nan)
+
+def _resize(array: np.ndarray, capacity: int, fill: Any) -> np.ndarray:
+    resized = np.full(capacity, fill, dtype=array.dtype)
+    count = min(capacity, array.shape[0])
+    resized[:count] = array[:count]
+    return resized
\ No newline at end of file
@@ -1,7 +1,25 @@
-from typing import Dict, List, Any
-from .vector_db import VectorDb, VectorSearchMatch
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
+from .vector_db import EMBEDDING_TEXT_FIELDS, VectorDb, VectorSearchMatch, create_product_text
+from .followup_engine import FollowupEngine
+from .keyword_index import KeywordIndex, reciprocal_rank_fusion
+from .product_filter import FilterIndex, ProductFilter
 from .openai_service import OpenAIService
+from .catalog_loader import LoadProgress
+from .metrics import metrics
+from .parallel_build import build_vectors_parallel
+from .product_catalog import ProductCatalog, catalog_hash
+from .response_cache import ResponseCache, make_cache_key, setup_response_cache
+from .semantic_cache import SemanticCache, setup_semantic_cache
+from .session_store import SessionNotFoundError, SessionStore, setup_session_store
+import numpy as np
+import asyncio
+import contextlib
+import hashlib
+import json
 import os
+import threading
+
+RETRIEVAL_MODES = ('dense', 'hybrid')
 
 class ProductWithMatch:
     def __init__(self, product: Dict[str, Any], match_score: float):
@@ -13,130 +31,600 @@ class ProductWithMatch:
         result['matchScore'] = self.match_score
         return result
 
+class QueryAnswer:
+    def __init__(self, matched_products: List[ProductWithMatch], response: str, rationale: List[str]):
+        self.matched_products = matched_products
+        self.products = [p.to_dict() for p in matched_products]
+        self.basic_response = response
+        self.basic_rationale = rationale
+        self.response = response
+        self.rationale = rationale
+        self.from_cache = False
+        self.needs_llm = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "response": self.response,
+            "products": self.products,
+            "rationale": self.rationale
+        }
+
+def model_info() -> Dict[str, Any]:
+
+    using_openai = bool(os.getenv('OPENAI_API_KEY'))
+    
+    return {
+        "model": "OpenAI GPT-4o" if using_openai else "E5-small",
+        "status": {
+            "percentage": 95 if using_openai else 73,
+            "health": "Healthy"
+        }
+    }
+
+def technical_info(catalog_size: int) -> Dict[str, Any]:
+
+    using_openai = bool(os.getenv('OPENAI_API_KEY'))
+    
+    return {
+        "embeddingModel": "E5-small (Open Source)",
+        "vectorDatabase": "Chroma (Open Source)",
+        "llm": "OpenAI GPT-4o" if using_openai else "Mistral 7B (Open Source)",
+        "vectorDimensions": 384,
+        "similarityMetric": "Cosine Similarity",
+        "catalogSize": f"{catalog_size} products indexed"
+    }
+
 class RAGService:
 
     
-    def __init__(self, vector_db: VectorDb, products: List[Dict[str, Any]]):
+    def __init__(self, vector_db: VectorDb, products: Union[List[Dict[str, Any]], ProductCatalog], index_path: Optional[str] = None,
+                 response_cache: Optional[ResponseCache] = None, catalog: Optional[ProductCatalog] = None,
+                 semantic_cache: Optional[SemanticCache] = None, session_store: Optional[SessionStore] = None):
         self.vector_db = vector_db
-        self.products = products
+        if catalog is None:
+            catalog = products if isinstance(products, ProductCatalog) else ProductCatalog(products)
+        self.catalog = catalog
+        self.catalog_version = catalog_hash(self.catalog)
         self.openai_service = OpenAIService()  
+        self.index_path = index_path or os.getenv('VECTOR_INDEX_PATH')
+        self.response_cache = response_cache if response_cache is not None else setup_response_cache()
+        self.semantic_cache = semantic_cache if semantic_cache is not None else setup_semantic_cache(vector_db.embedding_provider)
+        self.session_store = session_store if session_store is not None else setup_session_store()
+        self.followup_engine = None
+        if os.getenv('FOLLOWUP_ENGINE', '1').lower() not in ('0', 'false', 'no'):
+            self.followup_engine = FollowupEngine(self.catalog.store)
+        self.retrieval_mode = os.getenv('RETRIEVAL_MODE', 'dense')
+        self.hybrid_candidates = int(os.getenv('HYBRID_CANDIDATES', '50'))
+        self.rrf_k = int(os.getenv('HYBRID_RRF_K', '60'))
+        self.max_batch_queries = int(os.getenv('MAX_BATCH_QUERIES', '256'))
+        self._keyword_index = None
+        self._keyword_lock = threading.Lock()
+        self._filter_index = None
+        self._update_lock = threading.Lock()
 
-        self._initialize_vector_db(products)
+        self._initialize_vector_db()
         
-    def _initialize_vector_db(self, products: List[Dict[str, Any]]) -> None:
+    def _initialize_vector_db(self) -> None:
+
+        index_version = self.catalog.store.content_hash(EMBEDDING_TEXT_FIELDS) if self.index_path else None
+        if self.index_path and self.vector_db.load(self.index_path, index_version):
+            print(f"Loaded vector DB with {self.vector_db.get_size()} products from {self.index_path}")
+            return
+
+        batch_size = int(os.getenv('EMBEDDING_BATCH_SIZE', '1024'))
+        workers = int(os.getenv('INDEX_BUILD_WORKERS', '0')) or os.cpu_count() or 1
+        if (workers > 1 and self.vector_db.get_size() == 0
+                and len(self.catalog) >= int(os.getenv('INDEX_BUILD_PARALLEL_MIN', '50000'))):
+            build_vectors_parallel(self.vector_db, self.catalog, workers, batch_size, os.getenv('INDEX_BUILD_DIR'))
+        else:
+            progress = LoadProgress("Embedding catalog", total=len(self.catalog))
+            for batch in self.catalog.iter_batches(batch_size):
+                self.vector_db.add_products(batch)
+                progress.update(len(batch))
+            progress.finish()
+            self.vector_db.build_index()
+        print(f"Initialized vector DB with {len(self.catalog)} products")
 
-        for product in products:
-            self.vector_db.add_product(product)
-        print(f"Initialized vector DB with {len(products)} products")
+        if self.index_path:
+            try:
+                self.vector_db.save(self.index_path, index_version)
+            except OSError as e:
+                print(f"Error saving vector DB to {self.index_path}: {e}")
         
-    def process_query(self, query: str, max_results: int = 5, threshold: float = 0.5) -> Dict[str, Any]:
+    def process_query(self, query: str, max_results: int = 5, threshold: float = 0.5,
+                      mode: Optional[str] = None, product_filter: Optional[ProductFilter] = None) -> Dict[str, Any]:
 
-        query_embedding = self.vector_db.get_embedding(query)
+        with metrics.timer('rag_request_seconds', operation='query'):
+            mode = self._resolve_mode(mode)
+            cache_key = self._cache_key(query, max_results, threshold, mode, product_filter)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return self._with_session(query, cached)
 
-        match_results = self.vector_db.similarity_search(
-            query_embedding, 
-            limit=max_results,
-            score_threshold=threshold
-        )
+            query_embedding, match_results = self._retrieve(query, max_results, threshold, mode, product_filter)
 
-        matched_products = []
-        for match in match_results:
-            product = next((p for p in self.products if p['id'] == match.id), None)
-            if product:
-                matched_products.append(ProductWithMatch(product, match.score))
+            result = self._build_result(query, match_results, query_embedding)
 
-        matched_products.sort(key=lambda p: p.match_score, reverse=True)
+            if cache_key:
+                self.response_cache.set(cache_key, result)
+            return self._with_session(query, result)
 
-        product_dicts = [p.to_dict() for p in matched_products]
+    async def aprocess_query(self, query: str, max_results: int = 5, threshold: float = 0.5,
+                             mode: Optional[str] = None, product_filter: Optional[ProductFilter] = None) -> Dict[str, Any]:
 
-        basic_response = self._generate_response(query, matched_products)
+        with metrics.timer('rag_request_seconds', operation='query'):
+            mode = self._resolve_mode(mode)
+            cache_key = self._cache_key(query, max_results, threshold, mode, product_filter)
+            if cache_key:
+                cached = await asyncio.to_thread(self._cached_response, cache_key)
+                if cached is not None:
+                    return self._with_session(query, cached)
 
-        basic_rationale = self._generate_rationale(query, matched_products)
-        
-        if os.getenv('OPENAI_API_KEY') and matched_products:
-            try:
-                enhanced_response = self.openai_service.generate_enhanced_response(
-                    query, 
-                    [p.product for p in matched_products], 
-                    basic_response
-                )
-                
-                enhanced_rationale = self.openai_service.generate_enhanced_rationale(
+            query_embedding, match_results = await asyncio.to_thread(self._retrieve, query, max_results, threshold, mode, product_filter)
+
+            answer = self._prepare_answer(query, match_results, query_embedding)
+            if answer.needs_llm:
+                with self._llm_answer(answer, query_embedding):
+                    answer.response, answer.rationale = await self.openai_service.agenerate_enhanced_response_and_rationale(
+                        query,
+                        [p.product for p in answer.matched_products],
+                        answer.basic_response,
+                        answer.basic_rationale
+                    )
+
+            result = answer.to_dict()
+
+            if cache_key:
+                await asyncio.to_thread(self.response_cache.set, cache_key, result)
+            return self._with_session(query, result)
+
+    def process_queries(self, queries: List[str], max_results: int = 5, threshold: float = 0.5,
+                        mode: Optional[str] = None, product_filter: Optional[ProductFilter] = None) -> List[Dict[str, Any]]:
+        if not queries:
+            return []
+        if len(queries) > self.max_batch_queries:
+            raise ValueError(f"Too many queries, the maximum batch size is {self.max_batch_queries}")
+
+        with metrics.timer('rag_request_seconds', operation='batch'):
+            mode = self._resolve_mode(mode)
+            results = [None] * len(queries)
+            cache_keys = [self._cache_key(query, max_results, threshold, f"{mode}:retrieval", product_filter)
+                          for query in queries]
+
+            pending = []
+            for i, cache_key in enumerate(cache_keys):
+                cached = self._cached_response(cache_key)
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    pending.append(i)
+
+            if not pending:
+                return results
+
+            with metrics.span('embedding'):
+                query_matrix = self.vector_db.get_embeddings([queries[i] for i in pending])
+
+            with metrics.span('search'):
+                if mode == 'hybrid':
+                    batch_results = [
+                        self._hybrid_search(queries[i], query_embedding, max_results, threshold, product_filter)
+                        for i, query_embedding in zip(pending, query_matrix)
+                    ]
+                else:
+                    batch_results = self.vector_db.similarity_search_batch(
+                        query_matrix,
+                        limit=max_results,
+                        score_threshold=threshold,
+                        rows=self._filter_rows(product_filter)
+                    )
+
+            for i, query_embedding, match_results in zip(pending, query_matrix, batch_results):
+                results[i] = self._build_result(queries[i], match_results, use_llm=False)
+                if cache_keys[i]:
+                    self.response_cache.set(cache_keys[i], results[i])
+
+            return results
+
+    def upsert_products(self, products: List[Dict[str, Any]]) -> Dict[str, int]:
+        with self._update_lock:
+            changed = []
+            for product in products:
+                existing = self.catalog.get(product['id'])
+                if existing is None or create_product_text(existing) != create_product_text(product):
+                    changed.append(product)
+
+            self.vector_db.upsert_products(changed)
+            for product in products:
+                self.catalog.upsert(product)
+            self._update_keyword_index(changed, [])
+            self._catalog_changed('upsert', products)
+
+        return {"upserted": len(products), "reembedded": len(changed)}
+
+    def delete_products(self, product_ids: List[int]) -> int:
+        with self._update_lock:
+            removed = [product_id for product_id in product_ids if self.catalog.remove(product_id) is not None]
+            self.vector_db.delete_products(removed)
+            self._update_keyword_index([], removed)
+            self._catalog_changed('delete', removed)
+
+        return len(removed)
+
+    def _update_keyword_index(self, upserted: List[Dict[str, Any]], removed: List[int]) -> None:
+        with self._keyword_lock:
+            if self._keyword_index is None:
+                return
+            self._keyword_index.remove_documents(removed)
+            self._keyword_index.add_documents([product['id'] for product in upserted],
+                                              [create_product_text(product) for product in upserted])
+
+    def _catalog_changed(self, op: str, payload: List[Any]) -> None:
+        digest = hashlib.sha256(self.catalog_version.encode('utf-8'))
+        digest.update(json.dumps([op, payload], sort_keys=True, default=str).encode('utf-8'))
+        self.catalog_version = digest.hexdigest()
+
+        if self._filter_index is not None:
+            product_ids = [product['id'] for product in payload] if op == 'upsert' else payload
+            self._filter_index = self._filter_index.updated(self.vector_db.get_ids(), product_ids)
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        if self.response_cache:
+            self.response_cache.clear()
+        if self.semantic_cache:
+            self.semantic_cache.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        stats = {"enabled": False}
+        if self.response_cache:
+            stats = {"enabled": True, **self.response_cache.stats()}
+
+        stats["semantic"] = {"enabled": False}
+        if self.semantic_cache:
+            stats["semantic"] = {"enabled": True, **self.semantic_cache.stats()}
+
+        stats["sessions"] = {"enabled": False}
+        if self.session_store:
+            stats["sessions"] = {"enabled": True, **self.session_store.stats()}
+        return stats
+
+    def _cached_response(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not cache_key:
+            return None
+        with metrics.span('cache_lookup'):
+            cached = self.response_cache.get(cache_key)
+        metrics.inc('cache_requests_total', cache='response', result='miss' if cached is None else 'hit')
+        return cached
+
+    def _llm_available(self, operation: str) -> bool:
+        if self.openai_service.is_available():
+            return True
+        metrics.inc('llm_fallbacks_total', call=operation, reason='unavailable')
+        return False
+
+    def _with_session(self, query: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        with metrics.span('session'):
+            session_id = self._create_session(query, result['products'])
+        if session_id is None:
+            return result
+        return {**result, "sessionId": session_id}
+
+    def _create_session(self, query: str, products: List[Dict[str, Any]]) -> Optional[str]:
+        if not self.session_store:
+            return None
+        return self.session_store.create(query, [product['id'] for product in products])
+
+    def _cache_key(self, query: str, max_results: int, threshold: float, mode: str = 'dense',
+                   product_filter: Optional[ProductFilter] = None) -> Optional[str]:
+        if not self.response_cache:
+            return None
+        namespace = f"{self.catalog_version}:{mode}"
+        if product_filter:
+            namespace = f"{namespace}:{product_filter.cache_key()}"
+        return make_cache_key(query, max_results, threshold, namespace)
+
+    def _resolve_mode(self, mode: Optional[str]) -> str:
+        mode = (mode or self.retrieval_mode).lower()
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        return mode
+
+    def stream_query(self, query: str, max_results: int = 5, threshold: float = 0.5,
+                     mode: Optional[str] = None, product_filter: Optional[ProductFilter] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+
+        mode = self._resolve_mode(mode)
+        cache_key = self._cache_key(query, max_results, threshold, mode, product_filter)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            yield 'products', cached
+            yield 'done', {
+                "response": cached['response'],
+                "rationale": cached['rationale'],
+                "sessionId": self._create_session(query, cached['products'])
+            }
+            return
+
+        query_embedding, match_results = self._retrieve(query, max_results, threshold, mode, product_filter)
+
+        answer = self._prepare_answer(query, match_results, query_embedding, operation='stream')
+
+        yield 'products', {
+            "response": answer.basic_response,
+            "products": answer.products,
+            "rationale": answer.basic_rationale
+        }
+
+        if answer.from_cache:
+            yield 'token', {"text": answer.response}
+            yield 'rationale', {"rationale": answer.rationale}
+        elif answer.needs_llm:
+            tokens = []
+            with self._llm_answer(answer, query_embedding, operation='stream', stage='llm_stream'):
+                for event, data in self.openai_service.stream_enhanced_answer(
                     query,
-                    [p.product for p in matched_products],
-                    basic_rationale
-                )
+                    [p.product for p in answer.matched_products],
+                    answer.basic_response,
+                    answer.basic_rationale
+                ):
+                    if event == 'token':
+                        tokens.append(data)
+                        yield 'token', {"text": data}
+                    elif event == 'rationale':
+                        answer.rationale = data
+                        yield 'rationale', {"rationale": data}
+                if tokens:
+                    answer.response = ''.join(tokens).strip()
 
-                response = enhanced_response
-                rationale = enhanced_rationale
-            except Exception as e:
-                print(f"Error using OpenAI service: {e}")
-                response = basic_response
-                rationale = basic_rationale
-        else:
-            response = basic_response
-            rationale = basic_rationale
-        
-        return {
-            "response": response,
-            "products": product_dicts,
-            "rationale": rationale
+        if cache_key:
+            self.response_cache.set(cache_key, answer.to_dict())
+
+        yield 'done', {
+            "response": answer.response,
+            "rationale": answer.rationale,
+            "sessionId": self._create_session(query, answer.products)
         }
-    
-    def process_followup_query(self, original_query: str, followup_query: str) -> Dict[str, Any]:
 
-        if os.getenv('OPENAI_API_KEY'):
-            try:
+    def _retrieve(self, query: str, max_results: int, threshold: float, mode: str = 'dense',
+                  product_filter: Optional[ProductFilter] = None) -> Tuple[np.ndarray, List[VectorSearchMatch]]:
+
+        with metrics.span('embedding'):
+            query_embedding = self.vector_db.get_embedding(query)
+
+        with metrics.span('search'):
+            if mode == 'hybrid':
+                return query_embedding, self._hybrid_search(query, query_embedding, max_results, threshold, product_filter)
+
+            return query_embedding, self.vector_db.similarity_search(
+                query_embedding,
+                limit=max_results,
+                score_threshold=threshold,
+                rows=self._filter_rows(product_filter)
+            )
+
+    def _hybrid_search(self, query: str, query_embedding: np.ndarray, max_results: int, threshold: float,
+                       product_filter: Optional[ProductFilter] = None) -> List[VectorSearchMatch]:
+
+        candidates = self._get_keyword_index().search(query, max(self.hybrid_candidates, max_results * 10))
+        if product_filter:
+            candidates = [
+                (product_id, score) for product_id, score in candidates
+                if product_id in self.catalog and product_filter.matches(self.catalog.get(product_id))
+            ]
+        if candidates:
+            candidate_ids = [product_id for product_id, _ in candidates]
+            dense_scores = self.vector_db.score_ids(query_embedding, candidate_ids)
+            relevant = np.flatnonzero(dense_scores >= threshold)
+            candidates = [candidate_ids[i] for i in relevant]
+
+        if not candidates:
+            return self.vector_db.similarity_search(
+                query_embedding,
+                limit=max_results,
+                score_threshold=threshold,
+                rows=self._filter_rows(product_filter)
+            )
+
+        dense_ranking = [candidates[i] for i in np.argsort(-dense_scores[relevant], kind='stable')]
+
+        fused = reciprocal_rank_fusion([candidates, dense_ranking], self.rrf_k)
+        best_score = 2.0 / (self.rrf_k + 1)
+
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:max_results]
+        return [VectorSearchMatch(product_id, score / best_score) for product_id, score in ranked]
+
+    def _filter_rows(self, product_filter: Optional[ProductFilter]) -> Optional[np.ndarray]:
+        if not product_filter:
+            return None
+
+        filter_index = self._filter_index
+        if filter_index is None or filter_index.size != self.vector_db.get_ids().shape[0]:
+            filter_index = self._filter_index = FilterIndex(self.vector_db.get_ids(), self.catalog.store)
+        return filter_index.rows(product_filter)
+
+    def _get_keyword_index(self) -> KeywordIndex:
+        if self._keyword_index is None:
+            with self._keyword_lock:
+                if self._keyword_index is None:
+                    keyword_index = KeywordIndex()
+                    for batch in self.catalog.iter_batches(1024):
+                        keyword_index.add_documents(
+                            [product['id'] for product in batch],
+                            [create_product_text(product) for product in batch]
+                        )
+                    self._keyword_index = keyword_index
+        return self._keyword_index
 
-                query_embedding = self.vector_db.get_embedding(original_query)
-                match_results = self.vector_db.similarity_search(query_embedding, limit=5)
-                
-                context_products = []
-                for match in match_results:
-                    product = next((p for p in self.products if p['id'] == match.id), None)
-                    if product:
-                        context_products.append(product)
-
-                response = self.openai_service.generate_followup_response(
-                    original_query,
-                    followup_query,
-                    context_products
+    def _semantic_lookup(self, query_embedding: Optional[np.ndarray], matched_products: List[ProductWithMatch]) -> Optional[Tuple[str, List[str]]]:
+        if self.semantic_cache is None or query_embedding is None:
+            return None
+        with metrics.span('semantic_cache'):
+            cached_answer = self.semantic_cache.lookup(query_embedding, [p.product['id'] for p in matched_products])
+        metrics.inc('cache_requests_total', cache='semantic', result='miss' if cached_answer is None else 'hit')
+        return cached_answer
+
+    def _semantic_store(self, query_embedding: Optional[np.ndarray], matched_products: List[ProductWithMatch],
+                        response: str, rationale: List[str], basic_response: str) -> None:
+        if self.semantic_cache is None or query_embedding is None or response == basic_response:
+            return
+        self.semantic_cache.store(query_embedding, [p.product['id'] for p in matched_products], response, rationale)
+
+    def _match_products(self, match_results: List[VectorSearchMatch]) -> List[ProductWithMatch]:
+
+        with metrics.span('product_lookup'):
+            matched_products = []
+            for match in match_results:
+                product = self.catalog.get(match.id)
+                if product:
+                    matched_products.append(ProductWithMatch(product, match.score))
+
+            matched_products.sort(key=lambda p: p.match_score, reverse=True)
+        return matched_products
+
+    def _build_result(self, query: str, match_results: List[VectorSearchMatch], query_embedding: Optional[np.ndarray] = None,
+                      use_llm: bool = True) -> Dict[str, Any]:
+
+        answer = self._prepare_answer(query, match_results, query_embedding, use_llm)
+        if answer.needs_llm:
+            with self._llm_answer(answer, query_embedding):
+                answer.response, answer.rationale = self.openai_service.generate_enhanced_response_and_rationale(
+                    query,
+                    [p.product for p in answer.matched_products],
+                    answer.basic_response,
+                    answer.basic_rationale
                 )
-                return {"response": response}
-            except Exception as e:
-                print(f"Error using OpenAI for follow-up: {e}")
-        
-        combined_query = f"{original_query} {followup_query}"
-        response = self._generate_followup_response(combined_query, followup_query)
-        
-        return {
-            "response": response
-        }
+        return answer.to_dict()
+
+    def _prepare_answer(self, query: str, match_results: List[VectorSearchMatch], query_embedding: Optional[np.ndarray] = None,
+                        use_llm: bool = True, operation: str = 'query') -> QueryAnswer:
+
+        matched_products = self._match_products(match_results)
+
+        answer = QueryAnswer(
+            matched_products,
+            self._generate_response(query, matched_products),
+            self._generate_rationale(query, matched_products)
+        )
+
+        if use_llm and matched_products and self._llm_available(operation):
+            cached_answer = self._semantic_lookup(query_embedding, matched_products)
+            if cached_answer:
+                answer.response, answer.rationale = cached_answer
+                answer.from_cache = True
+            else:
+                answer.needs_llm = True
+        return answer
+
+    @contextlib.contextmanager
+    def _llm_answer(self, answer: QueryAnswer, query_embedding: Optional[np.ndarray], operation: str = 'query',
+                    stage: str = 'llm') -> Iterator[None]:
+        # Wraps the sync, async or streaming LLM call that fills in answer.response and answer.rationale.
+        try:
+            with metrics.span(stage):
+                yield
+        except Exception as e:
+            metrics.inc('llm_fallbacks_total', call=operation, reason='error')
+            print(f"Error using OpenAI service: {e}")
+            answer.response, answer.rationale = answer.basic_response, answer.basic_rationale
+        else:
+            self._semantic_store(query_embedding, answer.matched_products, answer.response, answer.rationale,
+                                 answer.basic_response)
     
-    def get_model_info(self) -> Dict[str, Any]:
+    def process_followup_query(self, original_query: Optional[str], followup_query: str,
+                               session_id: Optional[str] = None) -> Dict[str, Any]:
 
-        using_openai = bool(os.getenv('OPENAI_API_KEY'))
-        
-        return {
-            "model": "OpenAI GPT-4o" if using_openai else "E5-small",
-            "status": {
-                "percentage": 95 if using_openai else 73,
-                "health": "Healthy"
+        with metrics.timer('rag_request_seconds', operation='followup'):
+            session_id, session = self._followup_session(original_query, session_id)
+
+            context_products = self.catalog.get_many(session['productIds'])
+
+            source = 'spec'
+            response = self._answer_from_specs(followup_query, session)
+            if response is None and self._llm_available('followup'):
+                source = 'llm'
+                try:
+                    with metrics.span('llm'):
+                        response = self.openai_service.generate_followup_response(
+                            session['originalQuery'],
+                            followup_query,
+                            context_products,
+                            session['turns']
+                        )
+                except Exception as e:
+                    metrics.inc('llm_fallbacks_total', call='followup', reason='error')
+                    print(f"Error using OpenAI for follow-up: {e}")
+
+            if response is None:
+                source = 'template'
+                response = self._generate_followup_response(followup_query, context_products)
+            metrics.inc('followup_answers_total', source=source)
+
+            self._record_turn(session_id, session, followup_query, response)
+            return {
+                "response": response,
+                "sessionId": session_id
             }
-        }
+
+    async def aprocess_followup_query(self, original_query: Optional[str], followup_query: str,
+                                      session_id: Optional[str] = None) -> Dict[str, Any]:
+
+        with metrics.timer('rag_request_seconds', operation='followup'):
+            session_id, session = await asyncio.to_thread(self._followup_session, original_query, session_id)
+
+            context_products = self.catalog.get_many(session['productIds'])
+
+            source = 'spec'
+            response = self._answer_from_specs(followup_query, session)
+            if response is None and self._llm_available('followup'):
+                source = 'llm'
+                with metrics.span('llm'):
+                    response = await self.openai_service.agenerate_followup_response(
+                        session['originalQuery'],
+                        followup_query,
+                        context_products,
+                        session['turns']
+                    )
+            if response is None:
+                source = 'template'
+                response = self._generate_followup_response(followup_query, context_products)
+            metrics.inc('followup_answers_total', source=source)
+
+            await asyncio.to_thread(self._record_turn, session_id, session, followup_query, response)
+            return {
+                "response": response,
+                "sessionId": session_id
+            }
+
+    def _followup_session(self, original_query: Optional[str],
+                          session_id: Optional[str]) -> Tuple[Optional[str], Dict[str, Any]]:
+        if session_id and self.session_store:
+            with metrics.span('session'):
+                session = self.session_store.get(session_id)
+            if session is not None:
+                return session_id, session
+        if not original_query:
+            raise SessionNotFoundError(session_id)
+
+        _, match_results = self._retrieve(original_query, 5, 0.5)
+        product_ids = [match.id for match in match_results]
+        session_id = self.session_store.create(original_query, product_ids) if self.session_store else None
+        return session_id, {"originalQuery": original_query, "productIds": product_ids, "turns": []}
+
+    def _answer_from_specs(self, followup_query: str, session: Dict[str, Any]) -> Optional[str]:
+        if not self.followup_engine:
+            return None
+        with metrics.span('spec_answer'):
+            return self.followup_engine.answer(followup_query, session['productIds'])
+
+    def _record_turn(self, session_id: Optional[str], session: Dict[str, Any], query: str, response: str) -> None:
+        if session_id and self.session_store:
+            self.session_store.append_turn(session_id, session, query, response)
+    
+    def get_model_info(self) -> Dict[str, Any]:
+        return model_info()
     
     def get_technical_info(self) -> Dict[str, Any]:
-
-        using_openai = bool(os.getenv('OPENAI_API_KEY'))
-        
-        return {
-            "embeddingModel": "E5-small (Open Source)",
-            "vectorDatabase": "Chroma (Open Source)",
-            "llm": "OpenAI GPT-4o" if using_openai else "Mistral 7B (Open Source)",
-            "vectorDimensions": 384,
-            "similarityMetric": "Cosine Similarity",
-            "catalogSize": f"{len(self.products)} products indexed"
-        }
+        return technical_info(len(self.catalog))
     
     def _generate_response(self, query: str, products: List[ProductWithMatch]) -> str:
 
@@ -147,8 +635,14 @@ class RAGService:
         
         return f"Based on your query about \"{query}\", I've found {len(products)} {product_types} that match your requirements. Here are the top recommendations sorted by relevance."
     
-    def _generate_followup_response(self, combined_query: str, followup_query: str) -> str:
-        return f"Regarding your follow-up question about \"{followup_query}\", I've analyzed the products from your initial query. The Acer Nitro 5 has the best battery life among the recommended laptops, with up to 8 hours of usage on a single charge. The battery performance will vary based on usage, with gaming and video editing reducing the effective battery life."
+    def _generate_followup_response(self, followup_query: str, products: List[Dict[str, Any]]) -> str:
+
+        if not products:
+            return f"Regarding your follow-up question about \"{followup_query}\", I couldn't find the products from your earlier search. Please run a new search and ask again."
+
+        product_list = ", ".join(f"{p['name']} (${p['price']})" for p in products[:3])
+
+        return f"Regarding your follow-up question about \"{followup_query}\", I've analyzed the products from your initial query: {product_list}. Ask about a specific feature such as battery life, memory or price to compare them."
     
     def _generate_rationale(self, query: str, products: List[ProductWithMatch]) -> List[str]:
 
@@ -0,0 +1,164 @@
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+
+def make_cache_key(query: str, max_results: int, threshold: float, namespace: str = '') -> str:
+    normalized = ' '.join(query.lower().split())
+    return f"{namespace}|{max_results}|{threshold:.4f}|{normalized}"
+
+class ResponseCache:
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "size": self.size(),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": self.hits / lookups if lookups else 0.0
+        }
+
+    def _record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+class InMemoryResponseCache(ResponseCache):
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        super().__init__(max_entries, ttl_seconds)
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+
+            self._record(entry is not None)
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+class SQLiteResponseCache(ResponseCache):
+
+    def __init__(self, path: str, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        super().__init__(max_entries, ttl_seconds)
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute("SELECT value, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] < now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            elif row is not None:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+
+        with self._lock:
+            self._record(row is not None)
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl_seconds, now)
+            )
+            evicted = conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+
+        if evicted > 0:
+            with self._lock:
+                self.evictions += evicted
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def size(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+def setup_response_cache(path: Optional[str] = None, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None) -> Optional[ResponseCache]:
+    path = path or os.getenv('RESPONSE_CACHE_PATH')
+    max_entries = max_entries if max_entries is not None else int(os.getenv('RESPONSE_CACHE_SIZE', 1024))
+    ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('RESPONSE_CACHE_TTL', 300))
+
+    if max_entries <= 0:
+        return None
+    if path:
+        return SQLiteResponseCache(path, max_entries, ttl_seconds)
+    return InMemoryResponseCache(max_entries, ttl_seconds)
\ No newline at end of file
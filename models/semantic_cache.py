@@ -0,0 +1,127 @@
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import threading
+import time
+import numpy as np
+from .embeddings import EmbeddingProvider
+
+class SemanticCache:
+
+    def __init__(self, dimensions: int, max_entries: int = 512, similarity_threshold: float = 0.92,
+                 min_overlap: float = 0.6, ttl_seconds: float = 3600.0):
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.min_overlap = min_overlap
+        self.ttl_seconds = ttl_seconds
+
+        self._matrix = np.zeros((max_entries, dimensions), dtype=np.float32)
+        self._entries = []
+        self._last_access = np.zeros(max_entries, dtype=np.float64)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._similarity_bins = np.linspace(0.0, 1.0, 21)
+        self._similarity_counts = np.zeros(len(self._similarity_bins) - 1, dtype=np.int64)
+
+    def lookup(self, query_embedding: np.ndarray, product_ids: List[int]) -> Optional[Tuple[str, List[str]]]:
+        query = self._normalize(query_embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            scores = self._matrix[:len(self._entries)] @ query
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            self._record_similarity(similarity)
+
+            entry = self._entries[best]
+            if (similarity < self.similarity_threshold
+                    or entry['expires'] < now
+                    or _overlap(entry['productIds'], product_ids) < self.min_overlap):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._last_access[best] = now
+            return entry['response'], entry['rationale']
+
+    def store(self, query_embedding: np.ndarray, product_ids: List[int], response: str, rationale: List[str]) -> None:
+        query = self._normalize(query_embedding)
+        now = time.monotonic()
+        entry = {
+            "productIds": frozenset(product_ids),
+            "response": response,
+            "rationale": rationale,
+            "expires": now + self.ttl_seconds
+        }
+
+        with self._lock:
+            if len(self._entries) < self.max_entries:
+                slot = len(self._entries)
+                self._entries.append(entry)
+            else:
+                slot = int(np.argmin(self._last_access[:len(self._entries)]))
+                self._entries[slot] = entry
+                self.evictions += 1
+
+            self._matrix[slot] = query
+            self._last_access[slot] = now
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = []
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxEntries": self.max_entries,
+            "similarityThreshold": self.similarity_threshold,
+            "minOverlap": self.min_overlap,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+            "similarityHistogram": {
+                f"{low:.2f}-{high:.2f}": int(count)
+                for low, high, count in zip(self._similarity_bins[:-1], self._similarity_bins[1:], self._similarity_counts)
+            }
+        }
+
+    def _record_similarity(self, similarity: float) -> None:
+        index = int(np.clip(np.searchsorted(self._similarity_bins, similarity, side='right') - 1, 0, len(self._similarity_counts) - 1))
+        self._similarity_counts[index] += 1
+
+    def _normalize(self, vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+def _overlap(cached_ids: frozenset, product_ids: List[int]) -> float:
+    current = set(product_ids)
+    if not cached_ids and not current:
+        return 1.0
+    return len(cached_ids & current) / len(cached_ids | current)
+
+def setup_semantic_cache(embedding_provider: EmbeddingProvider) -> Optional[SemanticCache]:
+    max_entries = int(os.getenv('SEMANTIC_CACHE_SIZE', 0))
+    if max_entries <= 0:
+        return None
+    if not embedding_provider.semantic:
+        print(f"Semantic cache disabled: {embedding_provider.model_id} embeddings do not capture query meaning, "
+              f"set EMBEDDING_MODEL_PATH to a sentence-transformers model to enable it")
+        return None
+
+    return SemanticCache(
+        embedding_provider.dimensions,
+        max_entries=max_entries,
+        similarity_threshold=float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.92)),
+        min_overlap=float(os.getenv('SEMANTIC_CACHE_MIN_OVERLAP', 0.6)),
+        ttl_seconds=float(os.getenv('SEMANTIC_CACHE_TTL', 3600))
+    )
\ No newline at end of file
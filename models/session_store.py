@@ -0,0 +1,45 @@
+from typing import Any, Dict, List, Optional
+import os
+import uuid
+from .response_cache import InMemoryResponseCache, ResponseCache, SQLiteResponseCache
+
+class SessionNotFoundError(KeyError):
+    pass
+
+class SessionStore:
+
+    def __init__(self, backend: ResponseCache, max_turns: int = 6):
+        self.backend = backend
+        self.max_turns = max_turns
+
+    def create(self, query: str, product_ids: List[int]) -> str:
+        session_id = uuid.uuid4().hex
+        self.backend.set(session_id, {
+            "originalQuery": query,
+            "productIds": [int(product_id) for product_id in product_ids],
+            "turns": []
+        })
+        return session_id
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self.backend.get(session_id)
+
+    def append_turn(self, session_id: str, session: Dict[str, Any], query: str, response: str) -> None:
+        turns = session.get('turns', []) + [{"query": query, "response": response}]
+        self.backend.set(session_id, {**session, "turns": turns[-self.max_turns:]})
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.backend.stats(), "maxTurns": self.max_turns}
+
+def setup_session_store(path: Optional[str] = None, max_entries: Optional[int] = None,
+                        ttl_seconds: Optional[float] = None, max_turns: Optional[int] = None) -> Optional[SessionStore]:
+    path = path or os.getenv('SESSION_STORE_PATH')
+    max_entries = max_entries if max_entries is not None else int(os.getenv('SESSION_STORE_SIZE', 10000))
+    ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('SESSION_TTL', 1800))
+    max_turns = max_turns if max_turns is not None else int(os.getenv('SESSION_MAX_TURNS', 6))
+
+    if max_entries <= 0:
+        return None
+    if path:
+        return SessionStore(SQLiteResponseCache(path, max_entries, ttl_seconds), max_turns)
+    return SessionStore(InMemoryResponseCache(max_entries, ttl_seconds), max_turns)
\ No newline at end of file
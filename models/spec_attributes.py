@@ -0,0 +1,38 @@
+from typing import Dict, Mapping, Optional
+import re
+
+SIZE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(TB|GB)\b", re.IGNORECASE)
+
+SPEC_ATTRIBUTES = {
+    "batteryHours": (('battery', 'battery life'), re.compile(r"(\d+(?:\.\d+)?)\s*(?:hours|hrs|hr|h)\b", re.IGNORECASE)),
+    "memoryGb": (('memory', 'ram'), SIZE_PATTERN),
+    "storageGb": (('storage', 'ssd', 'hard drive'), SIZE_PATTERN),
+    "cpuGhz": (('processor', 'cpu'), re.compile(r"(\d+(?:\.\d+)?)\s*GHz", re.IGNORECASE)),
+    "cpuCores": (('processor', 'cpu'), re.compile(r"(\d+)\s*cores?\b", re.IGNORECASE)),
+    "refreshHz": (('display', 'screen'), re.compile(r"(\d+)\s*Hz\b", re.IGNORECASE)),
+    "gpuMemoryGb": (('graphics', 'gpu'), SIZE_PATTERN),
+}
+
+def parse_spec_attributes(specs: Mapping[str, str]) -> Dict[str, float]:
+    values = {str(key).lower(): str(value) for key, value in specs.items()}
+    attributes = {}
+
+    for name, (keys, pattern) in SPEC_ATTRIBUTES.items():
+        for key in keys:
+            value = _parse_value(values.get(key), pattern)
+            if value is not None:
+                attributes[name] = value
+                break
+    return attributes
+
+def _parse_value(text: Optional[str], pattern: re.Pattern) -> Optional[float]:
+    if not text:
+        return None
+    match = pattern.search(text)
+    if match is None:
+        return None
+
+    value = float(match.group(1))
+    if pattern is SIZE_PATTERN and match.group(2).upper() == 'TB':
+        value *= 1024
+    return value
\ No newline at end of file
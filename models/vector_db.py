@@ -1,74 +1,383 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+import json
+import os
+import shutil
+import tempfile
+import threading
+from .embeddings import EmbeddingProvider, HashEmbeddingProvider, setup_embedding_provider
 
 class VectorSearchMatch:
     def __init__(self, id: int, score: float):
         self.id = id
         self.score = score
 
+EMBEDDING_DIMENSIONS = 384
+QUERY_CHUNK_SIZE = 1024
+SCORE_CHUNK_ELEMENTS = 1 << 24
+
+def _text_seeds(texts: List[str]) -> np.ndarray:
+    return np.array([
+        int(np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).sum(dtype=np.int64))
+        for text in texts
+    ], dtype=np.int64)
+
+def embed_batch(texts: List[str], dimensions: int = EMBEDDING_DIMENSIONS) -> np.ndarray:
+    if not texts:
+        return np.zeros((0, dimensions), dtype=np.float32)
+
+    angles = (_text_seeds(texts)[:, None] + np.arange(dimensions)) * 0.1
+    embeddings = np.sin(angles)
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings /= np.where(norms > 0, norms, 1)
+
+    return embeddings.astype(np.float32)
+
 def simple_embedding(text: str) -> np.ndarray:
-    embedding = np.zeros(384)
-    seed = sum(ord(char) for char in text)
-    
-    for i in range(embedding.shape[0]):
-        angle = (seed + i) * 0.1
-        embedding[i] = np.sin(angle)
-    
-    norm = np.linalg.norm(embedding)
+    return embed_batch([text])[0]
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
     if norm > 0:
-        embedding = embedding / norm
-    
-    return embedding
+        return vector / norm
+    return vector
+
+class _VectorSnapshot:
+    __slots__ = ('matrix', 'ids', 'alive', 'size', 'deleted', 'row_index')
+
+    def __init__(self, matrix: np.ndarray, ids: np.ndarray, alive: np.ndarray, size: int, deleted: int = 0,
+                 row_index: Optional[Dict[int, int]] = None):
+        self.matrix = matrix
+        self.ids = ids
+        self.alive = alive
+        self.size = size
+        self.deleted = deleted
+        self.row_index = row_index
+
+    def get_row_index(self) -> Dict[int, int]:
+        if self.row_index is None:
+            rows = np.flatnonzero(self.alive[:self.size])
+            self.row_index = dict(zip(self.ids[rows].tolist(), rows.tolist()))
+        return self.row_index
 
 class VectorDb:
     
-    def __init__(self):
-        self.embeddings = {} 
-        self.product_texts = {}  
+    def __init__(self, dimensions: Optional[int] = None, initial_capacity: int = 64, embedding_provider: Optional[EmbeddingProvider] = None,
+                 compaction_ratio: float = 0.25):
+        self.embedding_provider = embedding_provider or HashEmbeddingProvider(dimensions or EMBEDDING_DIMENSIONS)
+        if dimensions and dimensions != self.embedding_provider.dimensions:
+            raise ValueError(f"Embedding provider produces {self.embedding_provider.dimensions}-dim vectors, expected {dimensions}")
+
+        dimensions = self.embedding_provider.dimensions
+        self.dimensions = dimensions
+        self._snapshot = _VectorSnapshot(
+            np.zeros((initial_capacity, dimensions), dtype=np.float32),
+            np.zeros(initial_capacity, dtype=np.int64),
+            np.ones(initial_capacity, dtype=bool),
+            0
+        )
+        self._write_lock = threading.RLock()
+        self.compaction_ratio = compaction_ratio
     
     def add_product(self, product: Dict[str, Any]) -> None:
+        self.add_products([product])
+
+    def add_products(self, products: List[Dict[str, Any]]) -> None:
+        if not products:
+            return
 
-        product_id = product['id']
+        product_ids = [product['id'] for product in products]
 
-        product_text = self._create_product_text(product)
+        product_texts = [self._create_product_text(product) for product in products]
 
-        embedding = simple_embedding(product_text)
-        
-        self.embeddings[product_id] = embedding
-        self.product_texts[product_id] = product_text
+        embeddings = self.embedding_provider.embed(product_texts)
+
+        self.add_vectors(product_ids, embeddings)
+    
+    def add_vectors(self, product_ids: List[int], vectors: np.ndarray) -> None:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        count = vectors.shape[0]
+
+        with self._write_lock:
+            snapshot = self._snapshot
+            size = snapshot.size
+            matrix, ids, alive = snapshot.matrix, snapshot.ids, snapshot.alive
+
+            capacity = matrix.shape[0]
+            while size + count > capacity:
+                capacity = max(1, capacity * 2)
+            if capacity != matrix.shape[0]:
+                matrix, ids, alive = self._grow(snapshot, capacity)
+
+            # Rows past the published size are invisible to readers, so they can be filled in place.
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            matrix[size:size + count] = vectors / np.where(norms > 0, norms, 1)
+            ids[size:size + count] = product_ids
+            alive[size:size + count] = True
+            row_index = snapshot.row_index
+            if row_index is not None:
+                row_index.update(zip(product_ids, range(size, size + count)))
+            self._publish(_VectorSnapshot(matrix, ids, alive, size + count, snapshot.deleted, row_index))
+
+    def upsert_products(self, products: List[Dict[str, Any]]) -> None:
+        if not products:
+            return
+
+        product_ids = [product['id'] for product in products]
+
+        product_texts = [self._create_product_text(product) for product in products]
+
+        embeddings = self.embedding_provider.embed(product_texts)
+
+        self.upsert_vectors(product_ids, embeddings)
+
+    def upsert_vectors(self, product_ids: List[int], vectors: np.ndarray) -> None:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        latest = {product_id: i for i, product_id in enumerate(product_ids)}
+
+        with self._write_lock:
+            row_index = self._snapshot.get_row_index()
+
+            existing = [(row_index[product_id], i) for product_id, i in latest.items() if product_id in row_index]
+            if existing:
+                rows, positions = (np.array(column, dtype=np.int64) for column in zip(*existing))
+                self._replace_rows(rows, vectors[positions])
+
+            new = [i for product_id, i in latest.items() if product_id not in row_index]
+            if new:
+                self.add_vectors([product_ids[i] for i in new], vectors[new])
+
+    def delete_products(self, product_ids: List[int]) -> int:
+        with self._write_lock:
+            snapshot = self._snapshot
+            row_index = snapshot.get_row_index()
+            rows = [row_index.pop(product_id) for product_id in set(product_ids) if product_id in row_index]
+            if not rows:
+                return 0
+
+            alive = snapshot.alive.copy()
+            alive[rows] = False
+            deleted = snapshot.deleted + len(rows)
+            self._publish(_VectorSnapshot(snapshot.matrix, snapshot.ids, alive, snapshot.size, deleted, row_index))
+            if deleted > self.compaction_ratio * snapshot.size:
+                self.compact()
+            return len(rows)
+
+    def compact(self) -> None:
+        with self._write_lock:
+            snapshot = self._snapshot
+            if snapshot.deleted == 0:
+                return
+
+            keep = np.flatnonzero(snapshot.alive[:snapshot.size])
+            self._publish(_VectorSnapshot(
+                np.ascontiguousarray(snapshot.matrix[keep]),
+                snapshot.ids[keep].copy(),
+                np.ones(keep.shape[0], dtype=bool),
+                keep.shape[0]
+            ), keep)
     
     def get_embedding(self, query: str) -> np.ndarray:
-        return simple_embedding(query)
+        return self.get_embeddings([query])[0]
+
+    def get_embeddings(self, queries: List[str]) -> np.ndarray:
+        return self.embedding_provider.embed_queries(queries)
     
-    def similarity_search(self, query_vector: np.ndarray, limit: int = 5, score_threshold: float = 0.5) -> List[VectorSearchMatch]:
+    def similarity_search(self, query_vector: np.ndarray, limit: int = 5, score_threshold: float = 0.5,
+                          rows: Optional[np.ndarray] = None) -> List[VectorSearchMatch]:
+        snapshot = self._snapshot
+        if rows is not None:
+            rows = rows[rows < snapshot.size]
+        if snapshot.size == 0 or limit <= 0 or (rows is not None and rows.size == 0):
+            return []
+
+        query = _normalize(np.asarray(query_vector, dtype=np.float32))
+        if rows is not None:
+            return self._top_k(snapshot.matrix[rows] @ query, limit, score_threshold, rows, snapshot)
+
+        scores = snapshot.matrix[:snapshot.size] @ query
+
+        return self._top_k(scores, limit, score_threshold, snapshot=snapshot)
+
+    def similarity_search_batch(self, query_matrix: np.ndarray, limit: int = 5, score_threshold: float = 0.5,
+                                rows: Optional[np.ndarray] = None) -> List[List[VectorSearchMatch]]:
+        queries = np.atleast_2d(np.asarray(query_matrix, dtype=np.float32))
+        snapshot = self._snapshot
+        if rows is not None:
+            rows = rows[rows < snapshot.size]
+        if snapshot.size == 0 or limit <= 0 or (rows is not None and rows.size == 0):
+            return [[] for _ in range(queries.shape[0])]
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms > 0, norms, 1)
+        matrix = snapshot.matrix[:snapshot.size] if rows is None else snapshot.matrix[rows]
+        chunk_size = max(1, min(QUERY_CHUNK_SIZE, SCORE_CHUNK_ELEMENTS // max(1, matrix.shape[0])))
+
         results = []
-        
-        for product_id, embedding in self.embeddings.items():
-            similarity = cosine_similarity([query_vector], [embedding])[0][0]
-            
-            if similarity >= score_threshold:
-                results.append(VectorSearchMatch(product_id, similarity))
-        
-        results.sort(key=lambda x: x.score, reverse=True)
-        
-        return results[:limit]
+        for start in range(0, queries.shape[0], chunk_size):
+            scores = queries[start:start + chunk_size] @ matrix.T
+            results.extend(self._top_k(row, limit, score_threshold, rows, snapshot) for row in scores)
+        return results
     
+    def score_ids(self, query_vector: np.ndarray, product_ids: List[int]) -> np.ndarray:
+        snapshot = self._snapshot
+        row_index = snapshot.get_row_index()
+
+        rows = np.array([row_index.get(product_id, -1) for product_id in product_ids], dtype=np.int64)
+        scores = np.full(len(product_ids), -1.0, dtype=np.float32)
+
+        # The row index is shared with later snapshots until compaction, so it can name rows this one lacks.
+        present = (rows >= 0) & (rows < snapshot.size)
+        if present.any():
+            query = _normalize(np.asarray(query_vector, dtype=np.float32))
+            scores[present] = snapshot.matrix[rows[present]] @ query
+        return scores
+
     def get_size(self) -> int:
-        return len(self.embeddings)
-    
+        snapshot = self._snapshot
+        return snapshot.size - snapshot.deleted
+
+    def get_ids(self) -> np.ndarray:
+        snapshot = self._snapshot
+        return snapshot.ids[:snapshot.size]
+
+    def save(self, path: str, catalog_hash: str) -> None:
+        with self._write_lock:
+            self.compact()
+            snapshot = self._snapshot
+            parent = os.path.dirname(os.path.abspath(path))
+            os.makedirs(parent, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix='.vector-index-', dir=parent)
+
+            try:
+                np.save(os.path.join(staging, 'vectors.npy'), snapshot.matrix[:snapshot.size])
+                np.save(os.path.join(staging, 'ids.npy'), snapshot.ids[:snapshot.size])
+                self._save_index(staging)
+                with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                    json.dump({
+                        "catalogHash": catalog_hash,
+                        "embeddingModel": self.embedding_provider.model_id,
+                        "dimensions": self.dimensions,
+                        "size": snapshot.size
+                    }, f)
+
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                os.replace(staging, path)
+            except Exception:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+    def load(self, path: str, catalog_hash: str) -> bool:
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (meta.get('catalogHash') != catalog_hash
+                or meta.get('embeddingModel') != self.embedding_provider.model_id
+                or meta.get('dimensions') != self.dimensions):
+            return False
+
+        matrix = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+        ids = np.load(os.path.join(path, 'ids.npy'), mmap_mode='r')
+        if matrix.shape != (meta['size'], self.dimensions) or ids.shape[0] != meta['size']:
+            return False
+
+        with self._write_lock:
+            self._set_matrix(ids, matrix)
+            if not self._load_index(path):
+                self._reset_index()
+        return True
+
+    def set_vectors(self, product_ids: np.ndarray, matrix: np.ndarray) -> None:
+        with self._write_lock:
+            self._set_matrix(product_ids, matrix)
+            self._reset_index()
+
+    def build_index(self) -> None:
+        pass
+
+    def _publish(self, snapshot: _VectorSnapshot, keep: Optional[np.ndarray] = None) -> None:
+        self._snapshot = snapshot
+
+    def _set_matrix(self, product_ids: np.ndarray, matrix: np.ndarray) -> None:
+        self._publish(_VectorSnapshot(matrix, product_ids, np.ones(matrix.shape[0], dtype=bool), matrix.shape[0]))
+
+    def _grow(self, snapshot: _VectorSnapshot, capacity: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        size = snapshot.size
+        matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        matrix[:size] = snapshot.matrix[:size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:size] = snapshot.ids[:size]
+        alive = np.ones(capacity, dtype=bool)
+        alive[:size] = snapshot.alive[:size]
+        return matrix, ids, alive
+
+    def _replace_rows(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        snapshot = self._snapshot
+        if not snapshot.matrix.flags.writeable:
+            snapshot = _VectorSnapshot(np.array(snapshot.matrix), snapshot.ids, snapshot.alive, snapshot.size,
+                                       snapshot.deleted, snapshot.row_index)
+            self._publish(snapshot)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        snapshot.matrix[rows] = vectors / np.where(norms > 0, norms, 1)
+
+    def _reset_index(self) -> None:
+        pass
+
+    def _save_index(self, path: str) -> None:
+        pass
+
+    def _load_index(self, path: str) -> bool:
+        return False
+
+    def _top_k(self, scores: np.ndarray, limit: int, score_threshold: float, rows: Optional[np.ndarray] = None,
+               snapshot: Optional[_VectorSnapshot] = None) -> List[VectorSearchMatch]:
+        snapshot = snapshot or self._snapshot
+        if snapshot.deleted:
+            alive = snapshot.alive[:snapshot.size] if rows is None else snapshot.alive[rows]
+            scores = np.where(alive, scores, -np.inf)
+
+        candidates = np.flatnonzero(scores >= score_threshold)
+        if candidates.size > limit:
+            top = np.argpartition(scores[candidates], -limit)[-limit:]
+            candidates = candidates[top]
+
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        ids = snapshot.ids[order] if rows is None else snapshot.ids[rows[order]]
+        return [VectorSearchMatch(int(product_id), float(scores[i])) for product_id, i in zip(ids, order)]
+
     def _create_product_text(self, product: Dict[str, Any]) -> str:
-        parts = [
-            product.get('name', ''),
-            product.get('description', ''),
-            f"Category: {product.get('category', '')}",
-        ]
-        
-        specs = product.get('specs', {})
-        for key, value in specs.items():
-            parts.append(f"{key}: {value}")
-        
-        return '. '.join(parts)
-
-def setup_vector_db() -> VectorDb:
-    return VectorDb()
\ No newline at end of file
+        return create_product_text(product)
+
+EMBEDDING_TEXT_FIELDS = ('name', 'description', 'category', 'specs')
+
+def create_product_text(product: Dict[str, Any]) -> str:
+    parts = [
+        product.get('name', ''),
+        product.get('description', ''),
+        f"Category: {product.get('category', '')}",
+    ]
+    
+    specs = product.get('specs', {})
+    for key, value in specs.items():
+        parts.append(f"{key}: {value}")
+    
+    return '. '.join(parts)
+
+def setup_vector_db(engine: Optional[str] = None, **options: Any) -> VectorDb:
+    engine = (engine or os.getenv('VECTOR_DB_ENGINE', 'exact')).lower()
+    if 'embedding_provider' not in options:
+        options['embedding_provider'] = setup_embedding_provider(dimensions=options.get('dimensions'))
+
+    if engine == 'exact':
+        return VectorDb(**options)
+    if engine == 'ivf':
+        from .ivf_index import IVFVectorDb
+        return IVFVectorDb(**options)
+
+    raise ValueError(f"Unknown vector DB engine: {engine}")
\ No newline at end of file
@@ -0,0 +1,71 @@
+from typing import Optional
+import os
+import threading
+from models.catalog_loader import load_catalog
+from models.catalog_updates import CatalogDeltaWatcher
+from models.product_catalog import ProductCatalog, load_product_catalog
+from models.rag_service import RAGService
+from models.vector_db import setup_vector_db
+
+_lock = threading.RLock()
+_catalog = None
+_rag_service = None
+_watcher = None
+_watcher_pid = None
+
+def get_catalog() -> ProductCatalog:
+    global _catalog
+    if _catalog is None:
+        with _lock:
+            if _catalog is None:
+                _catalog = _load_catalog()
+    return _catalog
+
+def _load_catalog() -> ProductCatalog:
+    catalog = ProductCatalog()
+    path = os.getenv('PRODUCT_CATALOG_PATH')
+    if path:
+        load_catalog(path, catalog)
+    else:
+        catalog.extend(load_product_catalog())
+    return catalog
+
+def get_rag_service() -> RAGService:
+    rag_service = _get_or_create_rag_service()
+    if _watcher_pid != os.getpid():
+        start_catalog_watcher()
+    return rag_service
+
+def _get_or_create_rag_service() -> RAGService:
+    global _rag_service
+    if _rag_service is None:
+        with _lock:
+            if _rag_service is None:
+                _rag_service = RAGService(setup_vector_db(), get_catalog())
+    return _rag_service
+
+def start_catalog_watcher() -> Optional[CatalogDeltaWatcher]:
+    global _watcher, _watcher_pid
+    with _lock:
+        if _watcher_pid != os.getpid():
+            _watcher_pid = os.getpid()
+            _watcher = None
+            path = os.getenv('CATALOG_DELTA_PATH')
+            if path:
+                _watcher = CatalogDeltaWatcher(
+                    path,
+                    _get_or_create_rag_service(),
+                    float(os.getenv('CATALOG_DELTA_INTERVAL_SECONDS', '2'))
+                )
+                _watcher.start()
+    return _watcher
+
+def is_initialized() -> bool:
+    return _rag_service is not None
+
+def preload() -> RAGService:
+    return _get_or_create_rag_service()
+
+def preload_if_configured() -> None:
+    if os.getenv('PRELOAD_SERVICES', '').lower() in ('1', 'true', 'yes'):
+        preload()
\ No newline at end of file
@@ -1,4 +1,5 @@
 let selectedProduct = null;
+let sessionId = null;
 
 document.addEventListener('DOMContentLoaded', function() {
     init();
@@ -74,9 +75,10 @@ async function handleSearch() {
     
     const resultsContainer = document.getElementById('results-container');
     resultsContainer.innerHTML = '<div class="loading">Processing your query...</div>';
+    sessionId = null;
     
     try {
-        const response = await fetch('/api/query', {
+        const response = await fetch('/api/query/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -84,12 +86,11 @@ async function handleSearch() {
             body: JSON.stringify({ query })
         });
         
-        if (!response.ok) {
+        if (!response.ok || !response.body) {
             throw new Error('Failed to process query');
         }
         
-        const data = await response.json();
-        displayResults(data, query);
+        await readQueryStream(response, query);
     } catch (error) {
         console.error('Error:', error);
         const resultsContainer = document.getElementById('results-container');
@@ -97,6 +98,85 @@ async function handleSearch() {
     }
 }
 
+async function readQueryStream(response, query) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let streamedResponse = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+        
+        buffer += decoder.decode(value, { stream: true });
+        const messages = buffer.split('\n\n');
+        buffer = messages.pop();
+        
+        messages.forEach(message => {
+            const event = parseStreamEvent(message);
+            if (!event) {
+                return;
+            }
+            
+            if (event.type === 'products') {
+                displayResults(event.data, query);
+            } else if (event.type === 'token') {
+                streamedResponse += event.data.text;
+                updateResponseMessage(streamedResponse);
+            } else if (event.type === 'rationale') {
+                updateRationale(event.data.rationale);
+            } else if (event.type === 'done') {
+                updateResponseMessage(event.data.response);
+                updateRationale(event.data.rationale);
+                sessionId = event.data.sessionId || null;
+            }
+        });
+    }
+}
+
+function parseStreamEvent(message) {
+    let type = 'message';
+    let data = '';
+    
+    message.split('\n').forEach(line => {
+        if (line.startsWith('event:')) {
+            type = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            data += line.slice(5).trim();
+        }
+    });
+    
+    if (!data) {
+        return null;
+    }
+    
+    return { type, data: JSON.parse(data) };
+}
+
+function updateResponseMessage(text) {
+    const responseMessage = document.querySelector('#results-container .response-message');
+    if (responseMessage) {
+        responseMessage.textContent = text;
+    }
+}
+
+function updateRationale(rationale) {
+    const rationaleList = document.querySelector('#results-container .rationale-list');
+    if (!rationaleList || !rationale || rationale.length === 0) {
+        return;
+    }
+    
+    rationaleList.innerHTML = '';
+    rationale.forEach(item => {
+        const rationaleItem = document.createElement('li');
+        rationaleItem.className = 'rationale-item';
+        rationaleItem.textContent = item;
+        rationaleList.appendChild(rationaleItem);
+    });
+}
+
 async function handleFollowUp() {
     const followUpInput = document.getElementById('followup-input');
     const followupQuery = followUpInput.value.trim();
@@ -118,7 +198,8 @@ async function handleFollowUp() {
             },
             body: JSON.stringify({ 
                 originalQuery, 
-                followupQuery 
+                followupQuery,
+                sessionId
             })
         });
         
@@ -127,6 +208,7 @@ async function handleFollowUp() {
         }
         
         const data = await response.json();
+        sessionId = data.sessionId || sessionId;
         
         followupContainer.innerHTML = `
             <div class="followup-question">"${followupQuery}"</div>
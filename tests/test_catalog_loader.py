@@ -0,0 +1,32 @@
+import json
+
+from models.catalog_loader import iter_product_chunks
+from models.product_catalog import ProductCatalog, load_product_catalog
+
+
+def _write_feed(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+
+
+def test_iter_product_chunks_skips_non_pair_specs(tmp_path):
+    path = tmp_path / "catalog.jsonl"
+    _write_feed(path, [
+        {"id": 1, "name": "Laptop", "specs": [["RAM", "16GB"]]},
+        {"id": 2, "name": "Phone", "specs": [1, 2]},
+        {"id": 3, "name": "Tablet"},
+    ])
+
+    chunks = list(iter_product_chunks(str(path), chunk_size=2))
+    assert [[product["id"] for product in chunk] for chunk in chunks] == [[1], [3]]
+
+
+def test_load_product_catalog_streams_into_store(tmp_path):
+    path = tmp_path / "catalog.jsonl"
+    _write_feed(path, [{"id": i, "name": f"Product {i}", "price": i} for i in range(25)])
+
+    products = load_product_catalog(str(path))
+    assert not isinstance(products, list)
+
+    catalog = ProductCatalog(products)
+    assert len(catalog) == 25
+    assert catalog.get(24).to_dict()["price"] == 24.0
\ No newline at end of file
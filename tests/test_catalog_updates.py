@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from models.catalog_loader import validate_product
+from models.catalog_updates import CatalogDeltaWatcher, parse_catalog_delta
+
+
+class RecordingService:
+
+    def __init__(self):
+        self.upserted = []
+        self.deleted = []
+
+    def upsert_products(self, products):
+        self.upserted.extend(products)
+        return {"upserted": len(products), "reembedded": len(products)}
+
+    def delete_products(self, product_ids):
+        self.deleted.extend(product_ids)
+        return len(product_ids)
+
+
+def test_validate_product_rejects_non_pair_specs():
+    with pytest.raises(ValueError, match="invalid specs"):
+        validate_product({"id": 1, "name": "Laptop", "specs": [1, 2]})
+
+
+def test_validate_product_accepts_pair_specs():
+    product = validate_product({"id": "7", "name": " Laptop ", "specs": [["RAM", "16GB"]]})
+    assert product["id"] == 7
+    assert product["name"] == "Laptop"
+    assert product["specs"] == {"RAM": "16GB"}
+
+
+def test_parse_catalog_delta_reports_line_of_non_pair_specs():
+    lines = [
+        json.dumps({"op": "delete", "id": 3}),
+        json.dumps({"op": "upsert", "product": {"id": 4, "name": "Phone", "specs": [1, 2]}}),
+    ]
+    with pytest.raises(ValueError, match="Line 2"):
+        parse_catalog_delta(lines)
+
+
+def test_watcher_skips_non_pair_specs_and_advances(tmp_path):
+    path = tmp_path / "delta.jsonl"
+    path.write_text(
+        json.dumps({"op": "upsert", "product": {"id": 4, "name": "Phone", "specs": [1, 2]}}) + "\n"
+        + json.dumps({"op": "delete", "id": 3}) + "\n"
+    )
+    service = RecordingService()
+    watcher = CatalogDeltaWatcher(str(path), service)
+
+    assert watcher.poll() == {"upserted": 0, "reembedded": 0, "deleted": 1}
+    assert service.deleted == [3]
+    assert watcher.poll() is None
\ No newline at end of file
@@ -0,0 +1,30 @@
+import pytest
+
+from models.followup_engine import classify_followup
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("which is the cheapest?", ("price", False)),
+    ("which is the most affordable?", ("price", False)),
+    ("most budget friendly one?", ("price", False)),
+    ("which one is the least expensive", ("price", False)),
+    ("which is the most expensive?", ("price", True)),
+    ("which has the most RAM", ("memoryGb", True)),
+    ("which has the most video memory", ("gpuMemoryGb", True)),
+    ("which has the most CPU cores", ("cpuCores", True)),
+    ("which has the longest battery life?", ("batteryHours", True)),
+    ("which costs less", ("price", False)),
+    ("top rated one?", ("rating", True)),
+])
+def test_classify_followup(query, expected):
+    assert classify_followup(query) == expected
+
+
+@pytest.mark.parametrize("query", [
+    "which is the best value for the price?",
+    "does the cheapest one have enough RAM?",
+    "what is the price?",
+    "which has the most RAM and the least storage",
+])
+def test_classify_followup_leaves_unmodified_attributes_to_the_llm(query):
+    assert classify_followup(query) is None
\ No newline at end of file
@@ -0,0 +1,89 @@
+import asyncio
+
+import openai
+import pytest
+
+from models.openai_service import LLMClient
+
+
+class CountingBucket:
+
+    def __init__(self):
+        self.acquired = []
+
+    def acquire(self, amount=1.0, timeout=None):
+        self.acquired.append(amount)
+
+    async def acquire_async(self, amount=1.0, timeout=None):
+        self.acquired.append(amount)
+
+
+def _client():
+    client = LLMClient(timeout=5.0, max_retries=3, backoff_seconds=0.0, failure_threshold=1, reset_seconds=0.0)
+    client.request_bucket = CountingBucket()
+    client.token_bucket = CountingBucket()
+    return client
+
+
+def _scripted_create(monkeypatch, *outcomes):
+    outcomes = list(outcomes)
+
+    def create(**kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def acreate(**kwargs):
+        return create(**kwargs)
+
+    monkeypatch.setattr(openai.ChatCompletion, 'create', create)
+    monkeypatch.setattr(openai.ChatCompletion, 'acreate', acreate)
+
+
+def test_retries_acquire_rate_limit_tokens(monkeypatch):
+    client = _client()
+    _scripted_create(monkeypatch, openai.error.RateLimitError("slow down"),
+                     openai.error.APIError("bad gateway", http_status=502), "ok")
+
+    assert client.chat_completion(messages=[{"role": "user", "content": "x" * 40}], max_tokens=10) == "ok"
+    assert client.request_bucket.acquired == [1, 1, 1]
+    assert client.token_bucket.acquired == [20.0, 20.0, 20.0]
+
+
+def test_async_retries_acquire_rate_limit_tokens(monkeypatch):
+    client = _client()
+    _scripted_create(monkeypatch, openai.error.RateLimitError("slow down"), "ok")
+
+    async def call():
+        try:
+            return await client.achat_completion(messages=[], max_tokens=10)
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(call()) == "ok"
+    assert client.request_bucket.acquired == [1, 1]
+
+
+def test_non_retryable_error_leaves_half_open_breaker_unresolved(monkeypatch):
+    client = _client()
+    client.breaker.record_failure()
+    assert client.breaker.state == 'half-open'
+
+    _scripted_create(monkeypatch, openai.error.InvalidRequestError("bad request", None))
+    with pytest.raises(openai.error.InvalidRequestError):
+        client.chat_completion(messages=[])
+
+    assert client.breaker.state == 'half-open'
+    assert client.breaker.allow()
+
+
+def test_aclose_closes_the_aiohttp_session():
+    client = _client()
+
+    async def open_and_close():
+        session = client._get_aiosession()
+        await client.aclose()
+        return session
+
+    assert asyncio.run(open_and_close()).closed
\ No newline at end of file
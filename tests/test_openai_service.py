@@ -0,0 +1,70 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from models.openai_service import OpenAIService
+
+PRODUCTS = [{"id": 1, "name": "Laptop", "description": "", "price": 999.0, "category": "Laptops", "specs": {}}]
+
+
+class ScriptedClient:
+
+    def __init__(self, *contents):
+        self.contents = list(contents)
+        self.calls = []
+
+    def chat_completion(self, timeout=None, **kwargs):
+        self.calls.append(kwargs)
+        content = self.contents.pop(0)
+        if isinstance(content, Exception):
+            raise content
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def achat_completion(self, timeout=None, **kwargs):
+        return self.chat_completion(timeout, **kwargs)
+
+    def is_available(self):
+        return True
+
+
+@pytest.fixture
+def api_key(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_GENERATION_MODE', 'combined')
+
+
+def _generate(service, use_async):
+    args = ("laptop", PRODUCTS, "initial", ["because"])
+    if use_async:
+        return asyncio.run(service.agenerate_enhanced_response_and_rationale(*args))
+    return service.generate_enhanced_response_and_rationale(*args)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_combined_answer_uses_one_call(api_key, use_async):
+    client = ScriptedClient(json.dumps({"response": "Better", "rationale": ["- Fast"]}))
+    service = OpenAIService(client=client)
+
+    assert _generate(service, use_async) == ("Better", ["Fast"])
+    assert len(client.calls) == 1
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_combined_error_returns_initial_answer(api_key, use_async):
+    client = ScriptedClient(openai.error.InvalidRequestError("bad request", None))
+    service = OpenAIService(client=client)
+
+    assert _generate(service, use_async) == ("initial", ["because"])
+    assert len(client.calls) == 1
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_unusable_combined_answer_falls_back_to_two_calls(api_key, use_async):
+    client = ScriptedClient("not json", "- Separate", "- Separate")
+    service = OpenAIService(client=client)
+
+    assert _generate(service, use_async) == ("- Separate", ["Separate"])
+    assert len(client.calls) == 3
\ No newline at end of file
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from models.product_catalog import load_product_catalog
+from models.rag_service import RAGService
+from models.vector_db import VectorDb
+
+
+class FakeOpenAIService:
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    def _answer(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("upstream unavailable")
+        return "Enhanced answer", ["Enhanced reason"]
+
+    def generate_enhanced_response_and_rationale(self, query, products, initial_response, initial_rationale):
+        return self._answer()
+
+    async def agenerate_enhanced_response_and_rationale(self, query, products, initial_response, initial_rationale):
+        return self._answer()
+
+    def stream_enhanced_answer(self, query, products, initial_response, initial_rationale):
+        response, rationale = self._answer()
+        yield 'token', response
+        yield 'rationale', rationale
+
+
+def _service(openai_service):
+    service = RAGService(VectorDb(), load_product_catalog())
+    service.openai_service = openai_service
+    return service
+
+
+def _sync(service):
+    return service.process_query("gaming laptop", threshold=-1.0)
+
+
+def _async(service):
+    return asyncio.run(service.aprocess_query("gaming laptop", threshold=-1.0))
+
+
+def _stream(service):
+    events = list(service.stream_query("gaming laptop", threshold=-1.0))
+    products = next(payload for event, payload in events if event == 'products')
+    done = events[-1][1]
+    return {**products, "response": done["response"], "rationale": done["rationale"]}
+
+
+@pytest.mark.parametrize("run", [_sync, _async, _stream])
+def test_query_paths_use_the_llm_answer(run):
+    openai_service = FakeOpenAIService()
+    result = run(_service(openai_service))
+
+    assert openai_service.calls == 1
+    assert result["response"] == "Enhanced answer"
+    assert result["rationale"] == ["Enhanced reason"]
+    assert result["products"]
+
+
+@pytest.mark.parametrize("run", [_sync, _async, _stream])
+def test_query_paths_fall_back_to_the_basic_answer_on_llm_errors(run):
+    result = run(_service(FakeOpenAIService(fail=True)))
+    basic = _service(FakeOpenAIService()).process_queries(["gaming laptop"], threshold=-1.0)[0]
+
+    assert result["response"] == basic["response"]
+    assert result["rationale"] == basic["rationale"]
+
+
+def test_query_paths_return_the_same_result():
+    results = [run(_service(FakeOpenAIService())) for run in (_sync, _async, _stream)]
+    results = [{key: result[key] for key in ("response", "products", "rationale")} for result in results]
+
+    assert results[0] == results[1] == results[2]
\ No newline at end of file
@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+
+from models.ivf_index import IVFVectorDb
+from models.vector_db import VectorDb
+
+
+def _random_vectors(rng, count, dimensions):
+    return rng.standard_normal((count, dimensions)).astype(np.float32)
+
+
+def _run_concurrently(db, rows_for_search=None, rounds=100):
+    dimensions = db.dimensions
+    rng = np.random.default_rng(0)
+    db.add_vectors(list(range(2000)), _random_vectors(rng, 2000, dimensions))
+    queries = _random_vectors(rng, 16, dimensions)
+
+    errors = []
+    done = threading.Event()
+
+    def search():
+        try:
+            while not done.is_set():
+                for query in queries:
+                    db.similarity_search(query, limit=5, score_threshold=-1.0, rows=rows_for_search)
+                db.similarity_search_batch(queries, limit=5, score_threshold=-1.0)
+                db.score_ids(queries[0], list(range(0, 4000, 7)))
+        except Exception as error:
+            errors.append(error)
+
+    readers = [threading.Thread(target=search) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+
+    next_id = 2000
+    writer_rng = np.random.default_rng(1)
+    try:
+        for _ in range(rounds):
+            live = db.get_ids()
+            db.delete_products(writer_rng.choice(live, 20, replace=False).tolist())
+            db.upsert_vectors(list(range(next_id, next_id + 10)) + live[:5].tolist(),
+                              _random_vectors(writer_rng, 15, dimensions))
+            next_id += 10
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+
+    assert errors == []
+    assert db.get_size() == len(set(db.get_ids().tolist()))
+
+
+def test_search_during_deletes_and_compaction():
+    _run_concurrently(VectorDb(dimensions=32, compaction_ratio=0.01))
+
+
+def test_filtered_search_with_rows_past_compacted_size():
+    _run_concurrently(VectorDb(dimensions=32, compaction_ratio=0.01), rows_for_search=np.arange(0, 2000, 3))
+
+
+def test_ivf_search_during_deletes_and_compaction():
+    db = IVFVectorDb(dimensions=32, min_train_size=256, nlist=16)
+    db.compaction_ratio = 0.01
+    _run_concurrently(db)
+
+
+def test_compaction_keeps_search_results():
+    rng = np.random.default_rng(2)
+    db = VectorDb(dimensions=16, compaction_ratio=0.01)
+    vectors = _random_vectors(rng, 100, 16)
+    db.add_vectors(list(range(100)), vectors)
+    db.delete_products(list(range(0, 100, 2)))
+
+    assert db.get_size() == 50
+    assert db.get_ids().tolist() == list(range(1, 100, 2))
+    match = db.similarity_search(vectors[51], limit=1, score_threshold=-1.0)
+    assert [m.id for m in match] == [51]
\ No newline at end of file
@@ -1,4 +1,7 @@
 from app import app
+import services
+
+services.preload_if_configured()
 
 if __name__ == "__main__":
     app.run()
\ No newline at end of file